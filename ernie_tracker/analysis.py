@@ -3,10 +3,12 @@
 """
 import pandas as pd
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 import sqlite3
-from .db import load_data_from_db
-from .config import DB_PATH
+from .db import load_data_from_db, get_data_version
+from .config import DB_PATH, SERIES_TO_CATEGORY
 
 
 # 百度官方模型识别规则
@@ -62,6 +64,61 @@ REPO_ORDER = ['Hugging Face', 'AI Studio', 'ModelScope', 'GitCode', '其他']
 REPO_ORDER_DETAILED = ['Hugging Face', 'AI Studio', 'ModelScope', 'GitCode', '魔乐 Modelers', '鲸智', 'Gitee']
 
 
+@lru_cache(maxsize=8)
+def _load_day_snapshot(date, data_version, platforms=None, columns=None):
+    """
+    读取某一天去重后的数据（按日期/数据库版本缓存，只读，不要直接修改返回值）
+
+    Args:
+        date: 日期 (YYYY-MM-DD)
+        data_version: 数据库版本标识，仅作为缓存键
+        platforms: 只读取这些平台（tuple，在 SQL 中筛选；None 表示全部平台）
+        columns: 只读取这些列（tuple；None 表示全部列）
+
+    Returns:
+        DataFrame: 查询结果
+    """
+    return load_data_from_db(
+        date_filter=date, platform_filter=list(platforms) if platforms else None,
+        last_value_per_model=False, columns=list(columns) if columns else None
+    )
+
+
+def _load_day_data(date):
+    """
+    读取某一天去重后的数据（不做“取最近有值”回填）
+
+    同一次周报中同一日期会被多个统计重复读取，数据库未变化时复用缓存的结果
+
+    Args:
+        date: 日期 (YYYY-MM-DD)
+
+    Returns:
+        DataFrame: 数据副本，调用方可以直接修改
+    """
+    return _load_day_snapshot(date, get_data_version()).copy()
+
+
+def _load_days_data(*dates):
+    """
+    并发读取多个日期去重后的数据（每次查询使用独立的 SQLite 连接，查询执行期间释放 GIL）
+
+    Args:
+        *dates: 日期 (YYYY-MM-DD)
+
+    Returns:
+        list: 与 dates 一一对应的数据副本，调用方可以直接修改
+    """
+    data_version = get_data_version()
+    unique_dates = list(dict.fromkeys(dates))
+    with ThreadPoolExecutor(max_workers=len(unique_dates)) as executor:
+        snapshots = dict(zip(
+            unique_dates,
+            executor.map(lambda date: _load_day_snapshot(date, data_version), unique_dates)
+        ))
+    return [snapshots[date].copy() for date in dates]
+
+
 def get_last_friday(current_date=None):
     """
     获取上周五的日期
@@ -224,6 +281,62 @@ def create_pivot_table(data, repo_order=None, model_order=None, group_by_publish
     return pivot_df
 
 
+# get_all_new_models 需要的列
+_NEW_MODEL_COLUMNS = (
+    'repo', 'publisher', 'model_name', 'download_count', 'model_type', 'model_category', 'base_model',
+)
+
+
+# 对比日期只需判断模型是否已存在：筛选系列和 (publisher, model_name) 用到的列
+_SERIES_KEY_COLUMNS = ('repo', 'publisher', 'model_name', 'model_category')
+
+
+@lru_cache(maxsize=8)
+def _previous_series_keys(date, data_version, target_category, name_pattern):
+    """
+    某一天 Hugging Face 上指定系列已存在的 (publisher, model_name)（去重，按日期/系列/数据库版本缓存，只读）
+
+    只读取判断系列和模型身份所需的列，其余列不从数据库读出
+
+    Args:
+        date: 日期 (YYYY-MM-DD)
+        data_version: 数据库版本标识，仅作为缓存键
+        target_category: 目标 model_category
+        name_pattern: 系列名称关键词
+
+    Returns:
+        DataFrame: publisher / model_name 两列，没有数据时为空
+    """
+    data = _load_day_snapshot(date, data_version, ('Hugging Face',), _SERIES_KEY_COLUMNS)
+    if data.empty:
+        return pd.DataFrame(columns=['publisher', 'model_name'])
+    return data.loc[_hf_series_mask(data, target_category, name_pattern), ['publisher', 'model_name']].drop_duplicates()
+
+
+def _hf_series_mask(data, target_category, name_pattern):
+    """
+    Hugging Face 平台上属于指定系列的记录掩码：model_category 匹配，或 model_name 包含系列关键词
+
+    名称正则只在 Hugging Face 且 model_category 不匹配的行上执行，其余行由两次等值比较直接确定
+
+    Args:
+        data: 数据
+        target_category: 目标 model_category
+        name_pattern: 系列名称关键词（不区分大小写的正则）
+
+    Returns:
+        np.ndarray: 布尔掩码
+    """
+    is_hf = (data['repo'] == 'Hugging Face').to_numpy(dtype=bool, na_value=False)
+    mask = is_hf & (data['model_category'] == target_category).to_numpy(dtype=bool, na_value=False)
+    by_name = is_hf & ~mask
+    if by_name.any():
+        mask[by_name] = data['model_name'][by_name].str.contains(
+            name_pattern, case=False, na=False
+        ).to_numpy(dtype=bool)
+    return mask
+
+
 def get_all_new_models(current_date, previous_date, model_series='ERNIE-4.5'):
     """
     获取本周新增的所有模型（完整列表）
@@ -240,8 +353,9 @@ def get_all_new_models(current_date, previous_date, model_series='ERNIE-4.5'):
     """
     try:
         # 从数据库加载数据（与 get_weekly_new_finetune_adapters 使用相同的加载方式）
-        current_data = load_data_from_db(date_filter=current_date)
-        previous_data = load_data_from_db(date_filter=previous_date)
+        # 只统计 Hugging Face，平台和列在 SQL 中筛选；下面只做筛选和读取，直接使用缓存的快照，不复制
+        data_version = get_data_version()
+        current_data = _load_day_snapshot(current_date, data_version, ('Hugging Face',), _NEW_MODEL_COLUMNS)
 
         if current_data.empty:
             return {
@@ -252,12 +366,7 @@ def get_all_new_models(current_date, previous_date, model_series='ERNIE-4.5'):
 
         # 🔧 修复：使用与 get_weekly_new_finetune_adapters() 相同的筛选逻辑
         # 根据 model_series 确定要筛选的 model_category
-        if model_series == 'ERNIE-4.5':
-            target_category = 'ernie-4.5'
-        elif model_series == 'PaddleOCR-VL':
-            target_category = 'paddleocr-vl'
-        else:
-            target_category = 'ernie-4.5'
+        target_category = SERIES_TO_CATEGORY.get(model_series, 'ernie-4.5')
 
         # 🔴 关键修复：先按 model_category 筛选模型系列，再判断新增
         # 新增判断只看 (repo, publisher, model_name) 三元组，不受 model_category 缺失影响
@@ -268,33 +377,20 @@ def get_all_new_models(current_date, previous_date, model_series='ERNIE-4.5'):
             name_pattern = 'PaddleOCR-VL'
 
         # 使用 model_category OR model_name 筛选，确保不遗漏因 model_category 缺失的模型
-        hf_current = current_data[
-            (current_data['repo'] == 'Hugging Face') & (
-                (current_data['model_category'] == target_category) |
-                (current_data['model_name'].str.contains(name_pattern, case=False, na=False))
-            )
-        ].copy()
+        hf_current = current_data[_hf_series_mask(current_data, target_category, name_pattern)]
 
-        if previous_data.empty:
-            hf_previous = pd.DataFrame()
-        else:
-            # 🔴 关键修复：previous_date 使用相同的筛选逻辑
-            # 这样即使之前的数据 model_category 为空，也能通过 model_name 匹配识别已存在的模型
-            hf_previous = previous_data[
-                (previous_data['repo'] == 'Hugging Face') & (
-                    (previous_data['model_category'] == target_category) |
-                    (previous_data['model_name'].str.contains(name_pattern, case=False, na=False))
-                )
-            ].copy()
+        # 🔴 关键修复：previous_date 使用相同的筛选逻辑
+        # 这样即使之前的数据 model_category 为空，也能通过 model_name 匹配识别已存在的模型
+        previous_keys = _previous_series_keys(previous_date, data_version, target_category, name_pattern)
 
         # 找出在当前数据中但不在对比数据中的模型（按 publisher+model_name 去重）
-        if hf_previous.empty:
-            new_models = hf_current.copy()
+        if previous_keys.empty:
+            new_models = hf_current
         else:
-            previous_keys = set(zip(hf_previous['publisher'], hf_previous['model_name']))
-            current_keys = set(zip(hf_current['publisher'], hf_current['model_name']))
-            new_keys = current_keys - previous_keys
-            new_models = hf_current[hf_current.apply(lambda r: (r['publisher'], r['model_name']) in new_keys, axis=1)].copy()
+            # 左连接对比期的 (publisher, model_name)，只保留对比期中没有的记录（一次哈希连接完成差集）
+            key_columns = ['publisher', 'model_name']
+            merged = hf_current[key_columns].merge(previous_keys, on=key_columns, how='left', indicator=True)
+            new_models = hf_current[(merged['_merge'] == 'left_only').to_numpy()]
 
         if new_models.empty:
             return {
@@ -308,23 +404,26 @@ def get_all_new_models(current_date, previous_date, model_series='ERNIE-4.5'):
             subset=['publisher', 'model_name'], keep='first'
         )
 
-        # 格式化模型列表，包含更多信息
+        # 格式化模型列表，包含更多信息（按列取值后逐行 zip，避免 iterrows 为每一行构造 Series）
+        optional_columns = [
+            col for col in ('model_type', 'model_category', 'base_model') if col in new_models_dedup.columns
+        ]
         models_list = []
-        for _, row in new_models_dedup.iterrows():
+        for model_name, publisher, repo, download_count, *optional_values in zip(*(
+            new_models_dedup[col].tolist()
+            for col in ['model_name', 'publisher', 'repo', 'download_count'] + optional_columns
+        )):
             model_info = {
-                'model_name': row['model_name'],
-                'publisher': row['publisher'],
-                'repo': row['repo'],
-                'download_count': int(row['download_count']),
+                'model_name': model_name,
+                'publisher': publisher,
+                'repo': repo,
+                'download_count': int(download_count),
             }
 
             # 添加可选字段
-            if 'model_type' in row and pd.notna(row['model_type']):
-                model_info['model_type'] = row['model_type']
-            if 'model_category' in row and pd.notna(row['model_category']):
-                model_info['model_category'] = row['model_category']
-            if 'base_model' in row and pd.notna(row['base_model']):
-                model_info['base_model'] = row['base_model']
+            for col, value in zip(optional_columns, optional_values):
+                if pd.notna(value):
+                    model_info[col] = value
 
             models_list.append(model_info)
 
@@ -373,12 +472,11 @@ def calculate_weekly_report(current_date=None, previous_date=None, model_order=N
     # 🔧 修复：使用 load_data_from_db() 获取去重后的数据
     # 这确保了重复记录只取最大下载量，避免重复计算
     # 官方/非官方的当日统计都应使用当天记录，不做“取最近有值”回填
-    current_data = load_data_from_db(date_filter=current_date, last_value_per_model=False)
-    previous_data = load_data_from_db(date_filter=previous_date, last_value_per_model=False)
+    current_data, previous_data = _load_days_data(current_date, previous_date)
 
     # 负增长检测使用真实的当日记录（不带 last_value_per_model），单独加载
-    warn_current_raw = load_data_from_db(date_filter=current_date, last_value_per_model=False)
-    warn_previous_raw = load_data_from_db(date_filter=previous_date, last_value_per_model=False)
+    warn_current_raw = _load_day_data(current_date)
+    warn_previous_raw = _load_day_data(previous_date)
 
     # 🔴 关键修复：在合并和进一步处理之前，对数据进行强制标准化和二次去重
     # 确保即使数据库中存在不一致，也能在分析时得到修正
@@ -456,7 +554,7 @@ def calculate_weekly_report(current_date=None, previous_date=None, model_order=N
     warn_previous_raw = mark_official_models(warn_previous_raw)
 
     # 筛选官方模型
-    official_data = data[data['is_official'] == True].copy()
+    official_data = data[data['is_official'] == True]
 
     if official_data.empty:
         print("警告: 在选定日期内未找到符合条件的官方模型数据。")
@@ -488,7 +586,7 @@ def calculate_weekly_report(current_date=None, previous_date=None, model_order=N
     top3_downloads = current_totals.head(3)
 
     # --- 衍生模型数据 ---
-    derivative_data = data[data['is_official'] == False].copy()
+    derivative_data = data[data['is_official'] == False]
     current_derivative_data = derivative_data[derivative_data['date'] == current_date]
     previous_derivative_data = derivative_data[derivative_data['date'] == previous_date]
     # 注意：此处 model_order=None，以包含所有衍生模型
@@ -686,29 +784,26 @@ def calculate_weekly_report(current_date=None, previous_date=None, model_order=N
         (all_previous_data['repo'] == 'Hugging Face') &
         (all_previous_data['is_official'] == False)
     ]
-    curr_deriv_keys = set(zip(hf_curr_non_official['publisher'], hf_curr_non_official['model_name']))
-    prev_deriv_keys = set(zip(hf_prev_non_official['publisher'], hf_prev_non_official['model_name']))
-    new_derivative_keys = curr_deriv_keys - prev_deriv_keys
-    derivative_new_models = len(new_derivative_keys)
-    # 列表明细（HF非官方新增差集）
-    derivative_new_models_list = []
-    if derivative_new_models > 0:
-        # 按下载量降序，保持唯一
-        hf_curr_non_official = hf_curr_non_official.sort_values('download_count', ascending=False)
-        seen = set()
-        for _, row in hf_curr_non_official.iterrows():
-            key = (row['publisher'], row['model_name'])
-            if key in new_derivative_keys and key not in seen:
-                seen.add(key)
-                derivative_new_models_list.append({
-                    'model_name': row['model_name'],
-                    'publisher': row['publisher'],
-                    'download_count': int(row.get('download_count', 0) or 0),
-                    'model_type': row.get('model_type'),
-                    'model_category': row.get('model_category'),
-                    'base_model': row.get('base_model'),
-                    'repo': row.get('repo')
-                })
+    # 差集、排序、去重依次在新增记录上完成，最后只对结果逐条生成明细
+    key_columns = ['publisher', 'model_name']
+    merged = hf_curr_non_official[key_columns].merge(
+        hf_prev_non_official[key_columns].drop_duplicates(), on=key_columns, how='left', indicator=True
+    )
+    new_derivatives = hf_curr_non_official[(merged['_merge'] == 'left_only').to_numpy()]
+    # 列表明细（HF非官方新增差集）：按下载量降序，每个模型保留一条
+    new_derivatives = new_derivatives.sort_values('download_count', ascending=False).drop_duplicates(
+        subset=key_columns, keep='first'
+    )
+    derivative_new_models = len(new_derivatives)
+    detail_columns = ['model_name', 'publisher', 'download_count', 'model_type', 'model_category', 'base_model', 'repo']
+    detail_values = [
+        new_derivatives[col].tolist() if col in new_derivatives.columns else [None] * derivative_new_models
+        for col in detail_columns
+    ]
+    derivative_new_models_list = [
+        dict(zip(detail_columns, row), download_count=int(row[2] or 0))
+        for row in zip(*detail_values)
+    ]
 
     # 社区维度 & 模型维度
     platform_top_models_df = pd.DataFrame(platform_top_models)
@@ -788,10 +883,13 @@ def calculate_weekly_report(current_date=None, previous_date=None, model_order=N
     # 🔧 修复：基于原始数据检测负增长，而不是基于 pivot 表
     # 这样能捕获所有模型（包括不在 model_order 中的衍生模型）
     # 修复：使用 REPO_ORDER_DETAILED 来单独检测 '魔乐 Modelers', '鲸智', 'Gitee' 的负增长
+    # 每个平台都要按 repo 整列比较一次，先转为 category，比较时只需对比整数编码
+    warn_previous_raw = warn_previous_raw.astype({'repo': 'category'})
+    warn_current_raw = warn_current_raw.astype({'repo': 'category'})
     for repo in REPO_ORDER_DETAILED: # 修改为 REPO_ORDER_DETAILED
-        # 获取该平台上周和本周的原始当日数据（不使用 last_value_per_model）
-        prev_platform_data = warn_previous_raw[warn_previous_raw['repo'] == repo].copy()
-        curr_platform_data = warn_current_raw[warn_current_raw['repo'] == repo].copy()
+        # 获取该平台上周和本周的原始当日数据（不使用 last_value_per_model；只读，无需复制）
+        prev_platform_data = warn_previous_raw[warn_previous_raw['repo'] == repo]
+        curr_platform_data = warn_current_raw[warn_current_raw['repo'] == repo]
 
         # 按模型+发布者聚合下载量，避免不同发布者的同名模型被合并
         prev_by_model = prev_platform_data.groupby(['model_name', 'publisher'])['download_count'].sum()
@@ -1091,13 +1189,13 @@ def get_deleted_or_hidden_models(current_date, model_series='ERNIE-4.5'):
         all_historical = load_data_from_db(date_filter=current_date, last_value_per_model=True)
 
         # 2. 获取当前日期的实际数据
-        current_actual = load_data_from_db(date_filter=current_date, last_value_per_model=False)
+        current_actual = _load_day_data(current_date)
 
         if all_historical.empty:
             return []
 
         # 3. 筛选目标系列的衍生模型
-        target_category = 'ernie-4.5' if model_series == 'ERNIE-4.5' else 'paddleocr-vl'
+        target_category = SERIES_TO_CATEGORY.get(model_series, 'paddleocr-vl')
 
         # 历史中的衍生模型
         historical_derivatives = all_historical[
@@ -1281,12 +1379,7 @@ def analyze_derivative_models_all_platforms(df, selected_series=None):
 
     # 按系列筛选（所有记录现在都有 model_category 字段）
     if selected_series:
-        series_mapping = {
-            "ERNIE-4.5": "ernie-4.5",
-            "PaddleOCR-VL": "paddleocr-vl"
-        }
-
-        selected_categories = [series_mapping.get(s, s) for s in selected_series]
+        selected_categories = [SERIES_TO_CATEGORY.get(s, s) for s in selected_series]
         df = df[df['model_category'].isin(selected_categories)].copy()
 
     # 统计总数
@@ -1319,13 +1412,8 @@ def analyze_derivative_models_all_platforms(df, selected_series=None):
         # 🔧 新增：按系列统计（如果选择了多个系列）
         by_series_stats = {}
         if selected_series and 'model_category' in platform_derivative_df.columns:
-            series_mapping = {
-                "ERNIE-4.5": "ernie-4.5",
-                "PaddleOCR-VL": "paddleocr-vl"
-            }
-
             for series in selected_series:
-                category = series_mapping.get(series, series)
+                category = SERIES_TO_CATEGORY.get(series, series)
                 series_df = platform_derivative_df[platform_derivative_df['model_category'] == category]
                 series_downloads = int(series_df['download_count_num'].sum())
 
@@ -1479,11 +1567,7 @@ def calculate_periodic_stats(current_date, selected_series=None, base_date=None)
     def filter_series(df):
         if df.empty or not selected_series:
             return df
-        series_mapping = {
-            "ERNIE-4.5": "ernie-4.5",
-            "PaddleOCR-VL": "paddleocr-vl"
-        }
-        selected_categories = [series_mapping.get(s, s) for s in selected_series]
+        selected_categories = [SERIES_TO_CATEGORY.get(s, s) for s in selected_series]
 
         # 🔴 关键修复：使用 model_category OR model_name 匹配，避免因 model_category 缺失导致假新增
         # 为每个系列创建筛选条件
@@ -1617,7 +1701,7 @@ def get_deleted_derivative_models_all_platforms(current_date, selected_series=No
         all_historical = load_data_from_db(date_filter=current_date, last_value_per_model=True)
 
         # 2. 获取当前日期的实际数据
-        current_actual = load_data_from_db(date_filter=current_date, last_value_per_model=False)
+        current_actual = _load_day_data(current_date)
 
         if all_historical.empty:
             return []
@@ -1654,8 +1738,7 @@ def get_deleted_derivative_models_all_platforms(current_date, selected_series=No
 
         # 6. 按系列筛选（如果指定）
         if selected_series:
-            series_mapping = {"ERNIE-4.5": "ernie-4.5", "PaddleOCR-VL": "paddleocr-vl"}
-            selected_categories = [series_mapping.get(s, s) for s in selected_series]
+            selected_categories = [SERIES_TO_CATEGORY.get(s, s) for s in selected_series]
             historical_derivatives = historical_derivatives[
                 historical_derivatives['model_category'].isin(selected_categories)
             ].copy()
@@ -1776,7 +1859,7 @@ def get_models_needing_backfill(current_date, selected_series=None):
     """
     try:
         # 1. 获取当前日期的实际数据
-        current_data = load_data_from_db(date_filter=current_date, last_value_per_model=False)
+        current_data = _load_day_data(current_date)
 
         if current_data.empty:
             return []
@@ -1798,8 +1881,7 @@ def get_models_needing_backfill(current_date, selected_series=None):
 
         # 4. 按系列筛选（如果指定）
         if selected_series:
-            series_mapping = {"ERNIE-4.5": "ernie-4.5", "PaddleOCR-VL": "paddleocr-vl"}
-            selected_categories = [series_mapping.get(s, s) for s in selected_series]
+            selected_categories = [SERIES_TO_CATEGORY.get(s, s) for s in selected_series]
             current_derivatives = current_derivatives[
                 current_derivatives['model_category'].isin(selected_categories)
             ].copy()
@@ -15,6 +15,16 @@ SELENIUM_TIMEOUT = 40
 SELENIUM_WINDOW_SIZE = "1920,1080"
 # 控制 Selenium 是否使用无头模式（统一入口，避免多版本代码）
 SELENIUM_HEADLESS = False
+# 鲸智固定链接并行抓取使用的浏览器数量
+# 每个浏览器约占 200MB 内存：并行模式下还会与 GitCode 等爬虫的浏览器同时运行，调大可加快抓取但会抬高内存峰值
+CAICT_CONCURRENCY = 2
+# Hugging Face model_info 并发请求数（纯网络 I/O，线程池重叠请求延迟）
+HF_MODEL_INFO_CONCURRENCY = 16
+# 各官方基座的 Model Tree / 关键词搜索列表请求并发数（每个列表内部还会并发获取详情，不宜过大）
+HF_LISTING_CONCURRENCY = 4
+# Hugging Face 请求遇到限流 / 服务端错误 / 网络错误时的重试次数与初始等待秒数（指数退避：1s, 2s, 4s, ...）
+HF_RETRY_ATTEMPTS = 5
+HF_RETRY_BASE_DELAY = 1
 
 # GitCode 模型链接列表
 GITCODE_MODEL_LINKS = [
@@ -79,3 +89,9 @@ PLATFORM_NAMES = {
     "modelers": "魔乐 Modelers",
     "gitee": "Gitee"
 }
+
+# 模型系列 -> model_category 映射
+SERIES_TO_CATEGORY = {
+    "ERNIE-4.5": "ernie-4.5",
+    "PaddleOCR-VL": "paddleocr-vl"
+}
@@ -1,4 +1,5 @@
 """数据库操作模块"""
+import os
 import sqlite3
 import pandas as pd
 from datetime import date, datetime
@@ -6,6 +7,9 @@ from .config import DB_PATH, DATA_TABLE, STATS_TABLE
 
 CUSTOM_MODELS_TABLE = "custom_models"
 
+# load_data_from_db(categorical=True) 时转为 category 的低基数列
+CATEGORICAL_COLUMNS = ('repo', 'model_category', 'model_type', 'publisher')
+
 
 def init_database():
     """初始化数据库表"""
@@ -69,6 +73,13 @@ def init_database():
     except Exception as e:
         print(f"更新数据库结构时出错: {e}")
 
+    # 按日期/平台/系列/模型名的索引：按日期读取快照、周报差集查询都走这个索引
+    # （查询条件写作 DATE(date)，索引使用同样的表达式）
+    conn.execute(f"""
+        CREATE INDEX IF NOT EXISTS idx_{DATA_TABLE}_date_repo_category_name
+        ON {DATA_TABLE} (DATE(date), repo, model_category, model_name)
+    """)
+
     # 创建平台统计表
     conn.execute(f"""
         CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
@@ -124,9 +135,13 @@ def save_to_db(df, db_path=DB_PATH):
         db_path: 数据库路径
     """
     conn = sqlite3.connect(db_path)
+    # WAL + NORMAL：批量写入只在提交时同步一次，且写入期间不阻塞页面读取
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
 
-    # 直接插入所有数据，不做去重
-    df.to_sql(DATA_TABLE, conn, if_exists="append", index=False)
+    # 直接插入所有数据，不做去重（to_sql 对 sqlite3 使用 executemany，整批在一个事务内提交）
+    with conn:
+        df.to_sql(DATA_TABLE, conn, if_exists="append", index=False)
     print(f"成功保存 {len(df)} 条记录到数据库（原始数据，未去重）")
 
     conn.close()
@@ -191,7 +206,36 @@ def get_previous_week_model_count(platform, days_ago=7):
     return row[0] if row and row[0] > 0 else None
 
 
-def load_data_from_db(date_filter=None, platform_filter=None, last_value_per_model=False):
+def get_data_version(db_path=None):
+    """
+    数据库内容的版本标识（主库文件与 WAL 文件的修改时间和大小）
+
+    任何进程写入数据后都会变化，可作为查询结果缓存的失效键
+
+    Args:
+        db_path: 数据库路径（默认 DB_PATH）
+
+    Returns:
+        tuple: 版本标识
+    """
+    db_path = db_path or DB_PATH
+    version = []
+    for path in (db_path, db_path + "-wal"):
+        try:
+            stat = os.stat(path)
+            version.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+def _valid_text_sql(column):
+    """SQL 条件：列值非空且不是 ''/'none'/'nan' 占位符（与读取后的 base_model 清洗规则一致）"""
+    return f"({column} IS NOT NULL AND TRIM({column}) != '' AND LOWER(TRIM({column})) NOT IN ('none', 'nan'))"
+
+
+def load_data_from_db(date_filter=None, platform_filter=None, last_value_per_model=False,
+                      model_category=None, require_base_model=False, columns=None, categorical=False):
     """
     从数据库中读取数据
 
@@ -207,6 +251,11 @@ def load_data_from_db(date_filter=None, platform_filter=None, last_value_per_mod
         date_filter: 日期过滤器，格式为 'YYYY-MM-DD'。在 last_value_per_model 模式下作为“截止日期”。
         platform_filter: 平台过滤器列表
         last_value_per_model: 是否按模型取“最后一个有值的节点”
+        model_category: 只返回该 model_category 的记录（在去重选出最佳记录之后过滤）
+        require_base_model: 只返回 base_model（或 base_model_from_api）有效的记录
+        columns: 只返回这些列（None 表示全部列）；需要 base_model 时会自动带上 base_model_from_api
+        categorical: 是否将 repo / model_category / model_type / publisher 转为 category 类型
+            （重复度高的列存为整数编码，比较更快；仅建议只读分析使用，写入新取值需先扩充类别）
 
     Returns:
         DataFrame: 查询结果（已去重）
@@ -238,35 +287,30 @@ def load_data_from_db(date_filter=None, platform_filter=None, last_value_per_mod
         if conditions:
             where_clause = "WHERE " + " AND ".join(conditions)
 
+        # 去重之后再应用的条件：model_category / base_model 不在分组键中，提前过滤会改变选出的最佳记录
+        post_conditions = []
+        if model_category:
+            post_conditions.append("model_category = ?")
+            params.append(model_category)
+        if require_base_model:
+            post_conditions.append(f"({_valid_text_sql('base_model')} OR {_valid_text_sql('base_model_from_api')})")
+        post_clause = "".join(f" AND {cond}" for cond in post_conditions)
+
+        # 列裁剪：base_model 的回填依赖 base_model_from_api
+        if columns:
+            select_columns = list(columns)
+            if 'base_model' in select_columns and 'base_model_from_api' not in select_columns:
+                select_columns.append('base_model_from_api')
+            select_clause = ", ".join(select_columns)
+        else:
+            select_clause = "*"
+
         # 构建基础去重（同日同模型取最优记录）
-        base_cte = f"""
-            WITH ranked AS (
-                SELECT
-                    *,
-                    rowid AS _rowid_,
-                    ROW_NUMBER() OVER (
-                        PARTITION BY date, repo, publisher, model_name
-                        ORDER BY
-                            (COALESCE(base_model, base_model_from_api) IS NOT NULL
-                             AND TRIM(COALESCE(base_model, base_model_from_api)) != ''
-                             AND LOWER(COALESCE(base_model, base_model_from_api)) NOT IN ('none', 'nan')) DESC,
-                            CASE data_source
-                                WHEN 'both' THEN 3
-                                WHEN 'model_tree' THEN 2
-                                WHEN 'search' THEN 1
-                                ELSE 0
-                            END DESC,
-                            CAST(download_count AS REAL) DESC,
-                            _rowid_ DESC
-                    ) AS rn
-                FROM {DATA_TABLE}
-                {where_clause}
-            )
-        """
+        base_cte = _ranked_cte(where_clause)
 
         if last_value_per_model:
             # 先选出每日最佳，再按 repo/publisher/model_name 取最近一条有值的记录（<= date_filter）
-            query = base_cte + """
+            query = base_cte + f"""
             , best_per_day AS (
                 SELECT * FROM ranked WHERE rn = 1
             ),
@@ -281,39 +325,153 @@ def load_data_from_db(date_filter=None, platform_filter=None, last_value_per_mod
                 WHERE download_count IS NOT NULL
                   AND LOWER(TRIM(download_count)) NOT IN ('', 'none', 'nan')
             )
-            SELECT * FROM latest_per_model WHERE rn_last = 1
+            SELECT {select_clause} FROM latest_per_model WHERE rn_last = 1{post_clause}
             """
         else:
-            query = base_cte + "SELECT * FROM ranked WHERE rn = 1"
+            query = base_cte + f"SELECT {select_clause} FROM ranked WHERE rn = 1{post_clause}"
 
         df = pd.read_sql_query(query, conn, params=params)
         conn.close()
 
         # 在“最后有效值”模式下，使用指定的 date_filter 作为快照日期，避免后续按 date 精确筛选时丢失记录
-        if last_value_per_model and date_filter and not df.empty:
+        if last_value_per_model and date_filter and not df.empty and 'date' in df.columns:
             df['date'] = date_filter
 
-        if not df.empty and 'base_model' in df.columns and 'base_model_from_api' in df.columns:
-            df['base_model'] = df.apply(
-                lambda row: row['base_model_from_api']
-                if (pd.isna(row['base_model']) or str(row['base_model']).strip().lower() in ['', 'none', 'nan'])
-                else row['base_model'],
-                axis=1
-            )
-        if not df.empty and 'base_model' in df.columns:
-            df['base_model'] = df['base_model'].apply(
-                lambda v: None if str(v).strip().lower() in ['', 'none', 'nan'] else v
+        return _finalize_loaded(df, categorical)
+
+    except Exception as e:
+        print(f"读取数据库数据失败: {e}")
+        import traceback
+        traceback.print_exc()
+        return pd.DataFrame()
+
+
+def load_new_models_between(current_date, previous_date, model_category=None, platform='Hugging Face',
+                            require_base_model=False, columns=None, categorical=False):
+    """
+    读取 current_date 中存在、但 previous_date 中不存在的模型（按 model_name 左反连接）
+
+    两个日期分别按 load_data_from_db 的规则去重并筛选后，在 SQL 中用 NOT EXISTS 求差集，
+    对比日期的记录不会读入内存
+
+    Args:
+        current_date: 本期日期 (YYYY-MM-DD)
+        previous_date: 对比日期 (YYYY-MM-DD)
+        model_category: 只比较该 model_category 的记录（在去重选出最佳记录之后过滤）
+        platform: 平台名称
+        require_base_model: 只比较 base_model（或 base_model_from_api）有效的记录
+        columns: 只返回这些列（None 表示全部列）；需要 base_model 时会自动带上 base_model_from_api
+        categorical: 是否将 repo / model_category / model_type / publisher 转为 category 类型
+
+    Returns:
+        DataFrame: 本期新增的记录（已去重）
+    """
+    try:
+        conn = sqlite3.connect(DB_PATH)
+
+        params = [current_date, previous_date, platform]
+        post_conditions = []
+        if model_category:
+            post_conditions.append("model_category = ?")
+            params.append(model_category)
+        if require_base_model:
+            post_conditions.append(f"({_valid_text_sql('base_model')} OR {_valid_text_sql('base_model_from_api')})")
+        post_clause = "".join(f" AND {cond}" for cond in post_conditions)
+
+        if columns:
+            select_columns = list(columns)
+            if 'base_model' in select_columns and 'base_model_from_api' not in select_columns:
+                select_columns.append('base_model_from_api')
+            select_clause = ", ".join(f"cur.{col}" for col in select_columns)
+        else:
+            select_clause = "cur.*"
+
+        # 模型名缺失的记录只与对比期中同样缺失模型名的记录匹配（IS 比较）
+        query = _ranked_cte("WHERE DATE(date) IN (?, ?) AND repo = ?") + f"""
+            , best AS (
+                SELECT * FROM ranked WHERE rn = 1{post_clause}
             )
+            SELECT {select_clause} FROM best AS cur
+            WHERE DATE(cur.date) = ?
+              AND NOT EXISTS (
+                  SELECT 1 FROM best AS prev
+                  WHERE DATE(prev.date) = ? AND prev.model_name IS cur.model_name
+              )
+        """
+        params.extend([current_date, previous_date])
+
+        df = pd.read_sql_query(query, conn, params=params)
+        conn.close()
 
-        return df
+        if columns is None:
+            df = df.drop(columns=['_rowid_', 'rn'], errors='ignore')
+        return _finalize_loaded(df, categorical)
 
     except Exception as e:
-        print(f"读取数据库数据失败: {e}")
+        print(f"读取新增模型失败: {e}")
         import traceback
         traceback.print_exc()
         return pd.DataFrame()
 
 
+def _ranked_cte(where_clause):
+    """
+    同日同模型去重的 CTE：ranked 中 rn = 1 的记录即 (date, repo, publisher, model_name) 的最佳记录
+
+    Args:
+        where_clause: 去重前应用的 WHERE 子句（可为空）
+
+    Returns:
+        str: WITH ranked AS (...) 子句
+    """
+    return f"""
+            WITH ranked AS (
+                SELECT
+                    *,
+                    rowid AS _rowid_,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY date, repo, publisher, model_name
+                        ORDER BY
+                            (COALESCE(base_model, base_model_from_api) IS NOT NULL
+                             AND TRIM(COALESCE(base_model, base_model_from_api)) != ''
+                             AND LOWER(COALESCE(base_model, base_model_from_api)) NOT IN ('none', 'nan')) DESC,
+                            CASE data_source
+                                WHEN 'both' THEN 3
+                                WHEN 'model_tree' THEN 2
+                                WHEN 'search' THEN 1
+                                ELSE 0
+                            END DESC,
+                            CAST(download_count AS REAL) DESC,
+                            _rowid_ DESC
+                    ) AS rn
+                FROM {DATA_TABLE}
+                {where_clause}
+            )
+        """
+
+
+def _finalize_loaded(df, categorical):
+    """读取后的统一清洗：base_model 回填 base_model_from_api、占位符转为 None，可选转为 category 类型"""
+    if not df.empty and 'base_model' in df.columns and 'base_model_from_api' in df.columns:
+        df['base_model'] = df.apply(
+            lambda row: row['base_model_from_api']
+            if (pd.isna(row['base_model']) or str(row['base_model']).strip().lower() in ['', 'none', 'nan'])
+            else row['base_model'],
+            axis=1
+        )
+    if not df.empty and 'base_model' in df.columns:
+        df['base_model'] = df['base_model'].apply(
+            lambda v: None if str(v).strip().lower() in ['', 'none', 'nan'] else v
+        )
+
+    if categorical and not df.empty:
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+
+    return df
+
+
 # ========== 自定义模型管理 ==========
 
 def parse_model_url(url):
@@ -3,12 +3,31 @@
 """
 import sqlite3
 import pandas as pd
-import shutil
 import os
 from datetime import datetime, date
 from .config import DB_PATH, DATA_TABLE, STATS_TABLE
 
 
+def _copy_database(src_path, dst_path):
+    """
+    用 SQLite 在线备份 API 复制数据库
+
+    数据库为 WAL 模式时，尚未检查点的写入还在 -wal 文件中，直接复制主文件会丢失这部分数据；
+    恢复时残留的 -wal/-shm 也会被重新应用到恢复后的数据上。backup() 通过 SQLite 读写，两种情况都能正确处理
+
+    Args:
+        src_path: 源数据库路径
+        dst_path: 目标数据库路径（已存在时整体覆盖）
+    """
+    src = sqlite3.connect(src_path)
+    dst = sqlite3.connect(dst_path)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
 def backup_database(backup_dir="backups"):
     """
     备份数据库
@@ -28,8 +47,8 @@ def backup_database(backup_dir="backups"):
         backup_filename = f"ernie_downloads_backup_{timestamp}.db"
         backup_path = os.path.join(backup_dir, backup_filename)
 
-        # 复制数据库文件
-        shutil.copy2(DB_PATH, backup_path)
+        # 复制数据库（包括 WAL 中尚未检查点的写入）
+        _copy_database(DB_PATH, backup_path)
 
         return True, backup_path
 
@@ -56,8 +75,8 @@ def restore_database(backup_path):
         if not success:
             return False, f"无法备份当前数据库: {current_backup}"
 
-        # 恢复备份
-        shutil.copy2(backup_path, DB_PATH)
+        # 恢复备份（通过 SQLite 写入当前数据库，不会残留旧的 -wal/-shm）
+        _copy_database(backup_path, DB_PATH)
 
         return True, f"数据库已恢复，当前数据库已备份到: {current_backup}"
 
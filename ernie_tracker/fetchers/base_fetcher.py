@@ -61,7 +61,8 @@ class BaseFetcher(ABC):
         pass
 
     def create_record(self, model_name, publisher, download_count, search_keyword=None,
-                     created_at=None, last_modified=None, url=None, model_category=None):
+                     created_at=None, last_modified=None, url=None, model_category=None,
+                     **extra_fields):
         """
         创建一条记录
 
@@ -74,6 +75,7 @@ class BaseFetcher(ABC):
             last_modified: 最后修改时间（可选）
             url: 模型详情页URL（可选）
             model_category: 模型分类（可选，如不提供则自动推断）
+            **extra_fields: 其他字段（如 model_type、base_model），值为 None 时不写入
 
         Returns:
             dict: 记录字典
@@ -99,6 +101,9 @@ class BaseFetcher(ABC):
             record["last_modified"] = last_modified
         if url:
             record["url"] = url
+        for key, value in extra_fields.items():
+            if value is not None:
+                record[key] = value
         return record
 
     def to_dataframe(self):
@@ -106,22 +111,19 @@ class BaseFetcher(ABC):
         if not self.results:
             return pd.DataFrame()
 
-        # 动态生成列名，包含所有可能的字段
-        all_columns = set()
-        for record in self.results:
-            all_columns.update(record.keys())
+        # 动态生成列名，包含所有可能的字段（dict 保留首次出现的顺序）
+        all_columns = dict.fromkeys(key for record in self.results for key in record)
 
         # 确保基础列在前
         base_columns = ["date", "repo", "model_name", "publisher", "download_count"]
         optional_columns = ["fetched_at", "search_keyword", "created_at", "last_modified", "url"]
-        ordered_columns = base_columns + [col for col in optional_columns if col in all_columns]
+        ordered_columns = dict.fromkeys(base_columns + [col for col in optional_columns if col in all_columns])
 
         # 添加其他可能出现的列
-        for col in all_columns:
-            if col not in ordered_columns:
-                ordered_columns.append(col)
+        ordered_columns.update(all_columns)
 
-        return pd.DataFrame(self.results, columns=ordered_columns)
+        # 一次性由记录列表构建 DataFrame，避免逐行 append/concat
+        return pd.DataFrame(self.results, columns=list(ordered_columns))
 
     def __call__(self, progress_callback=None, progress_total=None):
         """使实例可调用"""
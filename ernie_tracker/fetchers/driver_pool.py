@@ -0,0 +1,115 @@
+"""Chrome WebDriver 复用池 - 固定链接爬虫共享浏览器实例，避免每个爬虫重复启动 Chrome"""
+import atexit
+import threading
+import time
+from queue import Queue, Empty, Full
+
+from ..utils import create_chrome_driver
+
+
+class DriverPool:
+    """线程安全的 WebDriver 池
+
+    acquire() 优先取出空闲的 driver，没有则新建；release() 清理 cookies 后放回池中，
+    池满时直接关闭。空闲超过 idle_timeout 秒的 driver 会被后台定时器关闭，
+    避免长期运行的 Streamlit 服务在两次抓取之间一直占用浏览器内存；进程退出时自动 shutdown()。
+    """
+
+    def __init__(self, max_size=4, idle_timeout=60):
+        # 队列元素为 (driver, 归还时间)
+        self._drivers = Queue(maxsize=max_size)
+        self._idle_timeout = idle_timeout
+        self._reaper = None
+        self._reaper_lock = threading.Lock()
+
+    def acquire(self):
+        """取出一个可用的 driver（池为空时新建）"""
+        while True:
+            try:
+                driver, _ = self._drivers.get_nowait()
+            except Empty:
+                return create_chrome_driver()
+
+            # 校验空闲 driver 是否仍然存活（浏览器可能已崩溃或被关闭）
+            try:
+                driver.current_url
+                return driver
+            except Exception as e:
+                self._quit(driver, f"空闲 driver 已失效: {e}")
+
+    def release(self, driver):
+        """归还 driver；清理 cookies 避免不同站点间的会话串扰"""
+        if driver is None:
+            return
+        try:
+            driver.delete_all_cookies()
+            self._drivers.put_nowait((driver, time.monotonic()))
+        except Full:
+            self._quit(driver, "池已满")
+            return
+        except Exception as e:
+            # driver 已不可用，直接丢弃
+            self._quit(driver, f"清理 cookies 失败: {e}")
+            return
+        self._schedule_reap()
+
+    def shutdown(self):
+        """关闭池中所有 driver"""
+        with self._reaper_lock:
+            if self._reaper is not None:
+                self._reaper.cancel()
+                self._reaper = None
+        while True:
+            try:
+                driver, _ = self._drivers.get_nowait()
+            except Empty:
+                break
+            self._quit(driver)
+
+    def _schedule_reap(self):
+        """启动空闲回收定时器（已有定时器在等待时不重复启动）"""
+        with self._reaper_lock:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Timer(self._idle_timeout, self._reap_idle)
+            self._reaper.daemon = True
+            self._reaper.start()
+
+    def _reap_idle(self):
+        """关闭空闲超时的 driver，未超时的放回池中；池中仍有 driver 时重新计时"""
+        with self._reaper_lock:
+            self._reaper = None
+
+        now = time.monotonic()
+        kept = []
+        while True:
+            try:
+                driver, released_at = self._drivers.get_nowait()
+            except Empty:
+                break
+            if now - released_at >= self._idle_timeout:
+                self._quit(driver, f"空闲超过 {self._idle_timeout} 秒")
+            else:
+                kept.append((driver, released_at))
+
+        for item in kept:
+            try:
+                self._drivers.put_nowait(item)
+            except Full:
+                self._quit(item[0], "池已满")
+
+        if kept:
+            self._schedule_reap()
+
+    @staticmethod
+    def _quit(driver, reason=None):
+        if reason:
+            print(f"[DriverPool] 关闭 driver：{reason}")
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"[DriverPool] 关闭 driver 失败: {e}")
+
+
+DRIVER_POOL = DriverPool()
+atexit.register(DRIVER_POOL.shutdown)
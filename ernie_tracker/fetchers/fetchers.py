@@ -22,6 +22,10 @@ import pandas as pd
 import numpy as np
 import sqlite3
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from ..utils import DownloadTextStable, block_page_resources
 
 def save_to_db(df, db_path="ernie_downloads.db"):
     conn = sqlite3.connect(db_path)
@@ -657,6 +661,21 @@ PLATFORM_FETCHERS = {
 }
 
 
+# 通过“下载量”标签定位相邻的数值节点，一次 JS 往返返回文本，不依赖深层 XPath；
+# 标签找不到时再用 arguments[0] 传入的 XPath 兜底
+GITCODE_DOWNLOADS_JS = """
+var nodes = document.querySelectorAll('#app div, #app span');
+for (var i = 0; i < nodes.length; i++) {
+    var n = nodes[i];
+    if (n.childElementCount === 0 && /^下载(量|次数)?$/.test(n.textContent.trim()) && n.nextElementSibling) {
+        return n.nextElementSibling.textContent;
+    }
+}
+var r = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+return r ? r.textContent : null;
+"""
+
+
 def fetch_gitcode_paddleocr_vl_data(progress_callback=None, progress_total=None):
     """
     专门用于从 GitCode 获取 PaddleOCR-VL 模型数据的函数。
@@ -666,11 +685,13 @@ def fetch_gitcode_paddleocr_vl_data(progress_callback=None, progress_total=None)
     options.add_argument("--no-sandbox")
     options.add_argument("--window-size=1920,1080")
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    block_page_resources(driver)
     wait = WebDriverWait(driver, 40)
 
     results = []
     model_link = "https://ai.gitcode.com/paddlepaddle/PaddleOCR-VL"
     total_count = 1
+    downloads = "0"  # 默认值，仅在所有重试均失败时保留
 
     try:
         driver.get(model_link)
@@ -706,39 +727,31 @@ def fetch_gitcode_paddleocr_vl_data(progress_callback=None, progress_total=None)
                 print(f"点击后当前页面URL: {driver.current_url}")
             except Exception as click_e:
                 print(f"点击“模型介绍”标签或等待页面加载失败: {click_e}")
-                downloads = "0"
                 return pd.DataFrame(columns=["date", "repo", "model_name", "publisher", "download_count"]), 0
 
-        downloads = "0"
-        if downloads == "0":
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    time.sleep(2) # Add a small delay to allow the page to stabilize
-                    # 尝试原始 XPath 获取下载量
-                    downloads_xpath = '//*[@id="app"]/div/div[2]/div[2]/div/div/div/div/div/div[2]/div[1]/div[1]/div/div[2]'
-                    print(f"尝试获取下载量元素: {downloads_xpath}")
-                    downloads_element = wait.until(EC.presence_of_element_located((By.XPATH, downloads_xpath)))
-                    last_val = ""
-                    for _ in range(5):
-                        # Re-locate the element in each iteration to avoid StaleElementReferenceException
-                        downloads_element = wait.until(EC.presence_of_element_located((By.XPATH, downloads_xpath)))
-                        val = downloads_element.text.strip().replace(',', '')
-                        if val and val != last_val:
-                            last_val = val
-                            time.sleep(1)
-                        else:
-                            break
-                    downloads = last_val
-                    print(f"获取到下载量: {downloads}")
-                    break # If successful, break out of the retry loop
-                except (TimeoutException, NoSuchElementException, StaleElementReferenceException) as e:
-                    print(f"在 {driver.current_url} 页面获取下载量失败 (尝试 {attempt + 1}/{max_retries}): {e}")
-                    downloads = "0" # 最终失败，设为0
-                    if attempt == max_retries - 1: # If it's the last attempt, set downloads to "0"
-                        downloads = "0"
-                    else:
-                        time.sleep(2) # Wait before retrying
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                # 优先按“下载量”标签定位，原始 XPath 仅作兜底
+                downloads_xpath = '//*[@id="app"]/div/div[2]/div[2]/div/div/div/div/div/div[2]/div[1]/div[1]/div/div[2]'
+                print("尝试获取下载量元素")
+                # 每 100ms 轮询一次，数值可解析（含 k/M/w 简写）且两次轮询一致即返回
+                downloads = WebDriverWait(driver, 10, poll_frequency=0.1).until(
+                    DownloadTextStable(downloads_xpath, script=GITCODE_DOWNLOADS_JS)
+                )
+                print(f"获取到下载量: {downloads}")
+                break # If successful, break out of the retry loop
+            except StaleElementReferenceException as e:
+                # 元素被重新渲染，立即重试即可，无需等待
+                print(f"在 {driver.current_url} 页面获取下载量失败 (尝试 {attempt + 1}/{max_retries}): {e}")
+                if attempt == max_retries - 1: # 最终失败，设为0
+                    downloads = "0"
+            except (TimeoutException, NoSuchElementException) as e:
+                print(f"在 {driver.current_url} 页面获取下载量失败 (尝试 {attempt + 1}/{max_retries}): {e}")
+                if attempt == max_retries - 1: # 最终失败，设为0
+                    downloads = "0"
+                else:
+                    time.sleep(min(0.5 * (2 ** attempt), 4.0)) # 指数退避：0.5s, 1s, ... 最多 4s
 
         results.append({
             "date": today,
@@ -780,10 +793,28 @@ def fetch_paddleocr_vl_data(progress_callback=None, progress_total=None):
     all_dfs = []
     total_count = 0
 
-    for platform, fetcher in PLATFORM_FETCHERS_PADDLEOCR.items():
-        df, count = fetcher(progress_callback=progress_callback)
-        all_dfs.append(df)
-        total_count += count
+    # 各平台互相独立，并行抓取；回调加锁，避免多线程同时更新进度
+    callback = None
+    if progress_callback:
+        callback_lock = threading.Lock()
+
+        def callback(*args, **kwargs):
+            with callback_lock:
+                return progress_callback(*args, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=len(PLATFORM_FETCHERS_PADDLEOCR)) as executor:
+        future_to_platform = {
+            executor.submit(fetcher, progress_callback=callback): platform
+            for platform, fetcher in PLATFORM_FETCHERS_PADDLEOCR.items()
+        }
+        for future in as_completed(future_to_platform):
+            df, count = future.result()
+            if not df.empty:
+                all_dfs.append(df)
+            total_count += count
+
+    if not all_dfs:
+        return pd.DataFrame(columns=["date", "repo", "model_name", "publisher", "download_count"]), total_count
 
     final_df = pd.concat(all_dfs, ignore_index=True)
     return final_df, total_count
@@ -2,9 +2,40 @@
 Hugging Face 和 ModelScope 爬虫实现
 这两个平台使用 API，不需要 Selenium
 """
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
 from .base_fetcher import BaseFetcher
 from ..config import SEARCH_QUERY
 
+# ModelScope 搜索页使用的 JSON API（替代 Selenium 翻页抓取）
+MODELSCOPE_SEARCH_API = "https://modelscope.cn/api/v1/dolphin/models"
+
+# ModelScope 单个模型详情 API
+MODELSCOPE_MODEL_API = "https://modelscope.cn/api/v1/models/{model_id}"
+# Hugging Face 单个模型详情 API
+HF_MODEL_API = "https://huggingface.co/api/models/{model_id}"
+
+# Hugging Face / ModelScope 共用的 HTTP 连接池：keep-alive 复用 TCP+TLS 连接，
+# 避免逐个模型请求时每次重新握手
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+
+# ModelScope BaseModelRelation 可识别的标准类型
+MODELSCOPE_MODEL_TYPES = frozenset({'finetune', 'quantized', 'adapter', 'lora', 'merge'})
+
+
+def _fmt_ts(ts):
+    """将 ModelScope 返回的时间戳格式化为 YYYY-MM-DD，空值或解析失败返回 None"""
+    if not ts:
+        return None
+    try:
+        return datetime.fromtimestamp(ts).strftime('%Y-%m-%d')
+    except (TypeError, ValueError, OverflowError, OSError):
+        return None
+
 
 class HuggingFaceFetcher(BaseFetcher):
     """Hugging Face 爬虫"""
@@ -14,18 +45,30 @@ class HuggingFaceFetcher(BaseFetcher):
 
     def fetch(self, progress_callback=None, progress_total=None):
         """抓取 Hugging Face 数据"""
-        from huggingface_hub import list_models, model_info
+        from huggingface_hub import list_models
 
-        models = list(list_models(search=SEARCH_QUERY, full=True))
+        # 列表接口直接展开 downloadsAllTime，一次请求即可拿到全部下载量
+        models = list(list_models(search=SEARCH_QUERY, expand=["downloadsAllTime"]))
         total_count = len(models)
 
         for i, m in enumerate(models, start=1):
             try:
-                info = model_info(m.id, expand=["downloadsAllTime"])
+                download_count = getattr(m, 'downloads_all_time', None)
+
+                # 列表接口未返回下载量时，单独请求该模型的 downloadsAllTime
+                if download_count is None:
+                    resp = HTTP_SESSION.get(
+                        HF_MODEL_API.format(model_id=m.id),
+                        params={"expand": "downloadsAllTime"},
+                        timeout=30,
+                    )
+                    resp.raise_for_status()
+                    download_count = resp.json().get("downloadsAllTime")
+
                 self.results.append(self.create_record(
                     model_name=m.id,
                     publisher=m.id.split("/")[0],
-                    download_count=getattr(info, 'downloads_all_time', None)
+                    download_count=download_count
                 ))
             except Exception as e:
                 print(f"获取 {m.id} 失败: {e}")
@@ -43,79 +86,64 @@ class ModelScopeFetcher(BaseFetcher):
         super().__init__("ModelScope")
 
     def _get_model_ids(self):
-        """获取所有模型 ID"""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.common.exceptions import TimeoutException
-        from ..utils import create_chrome_driver
-
-        driver = create_chrome_driver()
-        wait = WebDriverWait(driver, 20)
-        model_ids = []
+        """通过 ModelScope 搜索页背后的 JSON API 分页获取所有模型 ID"""
+        model_ids = set()
         page = 1
+        page_size = 100
 
         while True:
-            url = f"https://modelscope.cn/search?page={page}&search={SEARCH_QUERY}&type=model"
-            print(f"[ModelScope] 爬取页面: {url}")
-            driver.get(url)
-
+            print(f"[ModelScope] 请求搜索 API 第 {page} 页")
             try:
-                wait.until(EC.presence_of_all_elements_located(
-                    (By.CSS_SELECTOR, "#normal_tab_model .antd5-row a")
-                ))
-            except TimeoutException:
-                print("页面加载失败，已到最后一页")
+                resp = HTTP_SESSION.put(
+                    MODELSCOPE_SEARCH_API,
+                    json={
+                        "PageSize": page_size,
+                        "PageNumber": page,
+                        "SortBy": "Default",
+                        "Target": "",
+                        "SingleCriterion": [],
+                        "Name": SEARCH_QUERY,
+                    },
+                    timeout=30,
+                )
+                resp.raise_for_status()
+                models = (resp.json().get("Data") or {}).get("Model", {}).get("Models") or []
+            except Exception as e:
+                print(f"[ModelScope] 搜索 API 请求失败，停止翻页: {e}")
                 break
 
-            cards = driver.find_elements(By.CSS_SELECTOR, "#normal_tab_model .antd5-row a")
-            if not cards:
+            if not models:
                 break
 
-            for link in cards:
-                href = link.get_attribute("href")
-                if "/models/" in href:
-                    model_id = href.split("/models/")[-1]
-                    model_ids.append(model_id)
+            model_ids.update(f"{m['Path']}/{m['Name']}" for m in models if m.get("Path") and m.get("Name"))
 
+            if len(models) < page_size:
+                break
             page += 1
 
-        driver.quit()
-        return list(set(model_ids))
+        return list(model_ids)
 
     def fetch(self, progress_callback=None, progress_total=None):
         """抓取 ModelScope 数据"""
-        from modelscope.hub.api import HubApi
         from .fetchers_modeltree import classify_model
 
         model_ids = self._get_model_ids()
         total_count = len(model_ids)
-        api = HubApi()
 
         for i, model_id in enumerate(model_ids, start=1):
             try:
-                info = api.get_model(model_id, revision="master")
+                resp = HTTP_SESSION.get(
+                    MODELSCOPE_MODEL_API.format(model_id=model_id),
+                    params={"Revision": "master"},
+                    timeout=30,
+                )
+                resp.raise_for_status()
+                info = resp.json().get("Data") or {}
                 downloads = info.get("Downloads", 0)
 
                 # 🔧 新增：获取时间字段
-                from datetime import datetime
-                created_at = None
-                last_modified = None
-
-                # 修改：使用 "in" 检查字段是否存在，而不是判断值是否为真
-                if "CreatedTime" in info and info["CreatedTime"]:
-                    try:
-                        created_at = datetime.fromtimestamp(info["CreatedTime"]).strftime('%Y-%m-%d')
-                    except Exception as e:
-                        print(f"  解析CreatedTime失败 ({model_id}): {e}")
-                        created_at = None
-
-                if "LastUpdatedTime" in info and info["LastUpdatedTime"]:
-                    try:
-                        last_modified = datetime.fromtimestamp(info["LastUpdatedTime"]).strftime('%Y-%m-%d')
-                    except Exception as e:
-                        print(f"  解析LastUpdatedTime失败 ({model_id}): {e}")
-                        last_modified = None
+                created_at = _fmt_ts(info.get("CreatedTime"))
+                last_modified = _fmt_ts(info.get("LastUpdatedTime"))
 
                 # 🔧 新增：提取模型分类信息
                 # 1. BaseModel (base_model)
@@ -126,28 +154,19 @@ class ModelScopeFetcher(BaseFetcher):
                     elif isinstance(info["BaseModel"], str):
                         base_model = info["BaseModel"]
 
-                # 2. BaseModelRelation (model_type)
-                model_type = None
-                if "BaseModelRelation" in info and info["BaseModelRelation"]:
-                    model_type = info["BaseModelRelation"].lower()
-                    # 映射到标准类型名称
-                    type_mapping = {
-                        'finetune': 'finetune',
-                        'quantized': 'quantized',
-                        'adapter': 'adapter',
-                        'lora': 'lora',
-                        'merge': 'merge'
-                    }
-                    if model_type not in type_mapping:
-                        model_type = 'other' if model_type else None
-                else:
-                    # 如果没有 BaseModelRelation，但也没有 base_model，则可能是 original
-                    if not base_model:
-                        model_type = 'original'
+                # 2. BaseModelRelation (model_type)，映射到标准类型名称
+                relation = info.get("BaseModelRelation")
+                model_type = relation.lower() if relation else None
+                if model_type and model_type not in MODELSCOPE_MODEL_TYPES:
+                    model_type = 'other'
+                elif not model_type and not base_model:
+                    # 没有 BaseModelRelation 也没有 base_model，视为 original
+                    model_type = 'original'
 
                 # 3. model_category - 使用 classify_model 函数根据名称、发布者和 base_model 推断
-                publisher = model_id.split("/")[0] if "/" in model_id else 'Unknown'
-                model_name = model_id.split("/", 1)[1] if "/" in model_id else model_id
+                parts = model_id.split("/", 1)
+                publisher = parts[0] if len(parts) > 1 else 'Unknown'
+                model_name = parts[1] if len(parts) > 1 else model_id
                 model_category = classify_model(model_name, publisher, base_model)
 
                 # 调试输出
@@ -156,7 +175,7 @@ class ModelScopeFetcher(BaseFetcher):
 
                 self.results.append(self.create_record(
                     model_name=model_id,
-                    publisher=model_id.split("/")[0],
+                    publisher=parts[0],
                     download_count=downloads,
                     created_at=created_at,
                     last_modified=last_modified,
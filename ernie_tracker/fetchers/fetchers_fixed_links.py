@@ -1,8 +1,10 @@
 """固定链接爬虫实现 - GitCode 和 CAICT（鲸智）"""
-import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
 from .base_fetcher import BaseFetcher
-from ..utils import create_chrome_driver
-from ..config import GITCODE_MODEL_LINKS, CAICT_MODEL_LINKS, SELENIUM_TIMEOUT
+from .driver_pool import DRIVER_POOL
+from ..utils import DownloadTextStable, block_page_resources, no_implicit
+from ..config import GITCODE_MODEL_LINKS, CAICT_MODEL_LINKS, CAICT_CONCURRENCY, SELENIUM_TIMEOUT
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -16,50 +18,54 @@ class GitCodeFetcher(BaseFetcher):
 
     def fetch(self, progress_callback=None, progress_total=None):
         """抓取 GitCode 数据"""
-        driver = create_chrome_driver()
+        driver = DRIVER_POOL.acquire()
         wait = WebDriverWait(driver, SELENIUM_TIMEOUT)
         total_count = len(GITCODE_MODEL_LINKS)
 
-        for i, model_link in enumerate(GITCODE_MODEL_LINKS, start=1):
-            try:
-                driver.get(model_link)
-
-                model_name = wait.until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR,
-                        "#repo-banner-box > div > div.repo-info.h-full.ai-hub > div > "
-                        "div:nth-child(1) > div > div > div.info-item.project-name > "
-                        "div.project-text > div > p > a > span"))
-                ).text.strip()
-
-                downloads_element = wait.until(
-                    EC.presence_of_element_located((By.XPATH,
-                        '//*[@id="app"]/div/div[2]/div[2]/div/div/div/div/div/div[2]/'
-                        'div[1]/div[1]/div/div[2]'))
-                )
-
-                # 等待下载量加载完成
-                last_val = ""
-                for _ in range(5):
-                    val = downloads_element.text.strip().replace(',', '')
-                    if val and val != last_val:
-                        last_val = val
-                        time.sleep(1)
-                    else:
-                        break
-
-                self.results.append(self.create_record(
-                    model_name=model_name,
-                    publisher="飞桨PaddlePaddle",
-                    download_count=last_val
-                ))
-
-            except Exception as e:
-                print(f"获取 {model_link} 失败: {e}")
-
-            if progress_callback:
-                progress_callback(i, discovered_total=total_count)
-
-        driver.quit()
+        # GitCode 页面只需要文本，拦截图片/字体/统计脚本
+        block_page_resources(driver)
+
+        # 本循环只使用显式等待，关闭隐式等待避免每次轮询被额外阻塞
+        try:
+            with no_implicit(driver):
+                for i, model_link in enumerate(GITCODE_MODEL_LINKS, start=1):
+                    try:
+                        driver.get(model_link)
+
+                        model_name = wait.until(
+                            EC.visibility_of_element_located((By.CSS_SELECTOR,
+                                "#repo-banner-box > div > div.repo-info.h-full.ai-hub > div > "
+                                "div:nth-child(1) > div > div > div.info-item.project-name > "
+                                "div.project-text > div > p > a > span"))
+                        ).text.strip()
+
+                        downloads_xpath = (
+                            '//*[@id="app"]/div/div[2]/div[2]/div/div/div/div/div/div[2]/'
+                            'div[1]/div[1]/div/div[2]'
+                        )
+                        wait.until(EC.presence_of_element_located((By.XPATH, downloads_xpath)))
+
+                        # 等待下载量加载完成（每 100ms 轮询，数值稳定即返回）
+                        downloads = WebDriverWait(driver, 10, poll_frequency=0.1).until(
+                            DownloadTextStable(downloads_xpath)
+                        )
+
+                        self.results.append(self.create_record(
+                            model_name=model_name,
+                            publisher="飞桨PaddlePaddle",
+                            download_count=downloads
+                        ))
+
+                    except Exception as e:
+                        print(f"获取 {model_link} 失败: {e}")
+
+                    if progress_callback:
+                        progress_callback(i, discovered_total=total_count)
+        finally:
+            # driver 会归还给池复用，取消拦截避免影响其他站点
+            block_page_resources(driver, [])
+            DRIVER_POOL.release(driver)
+
         return self.to_dataframe(), total_count
 
 
@@ -69,44 +75,83 @@ class CAICTFetcher(BaseFetcher):
     def __init__(self):
         super().__init__("鲸智")
 
-    def fetch(self, progress_callback=None, progress_total=None):
-        """抓取鲸智数据"""
-        driver = create_chrome_driver()
+    def _scrape_links(self, links, done_queue):
+        """用一个 driver 依次抓取分配到的链接，返回 {序号: 记录}；每成功一个向 done_queue 放入其序号"""
+        records = {}
+        driver = DRIVER_POOL.acquire()
         wait = WebDriverWait(driver, SELENIUM_TIMEOUT)
-        total_models = len(CAICT_MODEL_LINKS)
 
-        for idx, model_link in enumerate(CAICT_MODEL_LINKS, start=1):
-            print(f"[鲸智] 正在处理 {idx}/{total_models}：{model_link}")
-            driver.get(model_link)
-
-            try:
-                model_name = wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR,
-                        "#community-app > div > div:nth-child(2) > "
-                        "div.w-full.bg-\\[\\#FCFCFD\\].pt-9.pb-\\[60px\\].xl\\:px-10.md\\:px-0.md\\:pb-6.md\\:h-auto > "
-                        "div > div.flex.flex-col.gap-\\[16px\\].flex-wrap.mb-\\[8px\\].text-lg.text-\\[\\#606266\\]."
-                        "font-semibold.md\\:px-5 > div > a"))
-                ).text.strip()
-
-                downloads = wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR,
-                        "#pane-summary > div > div.w-\\[40\\%\\].sm\\:w-\\[100\\%\\].border-l.border-\\[\\#EBEEF5\\]."
-                        "md\\:border-l-0.md\\:border-b.md\\:w-full.md\\:pl-0 > div > "
-                        "div.text-\\[\\#303133\\].text-base.font-semibold.leading-6.mt-1.md\\:pl-0"))
-                ).text.strip().replace(',', '')
-
-                self.results.append(self.create_record(
-                    model_name=model_name,
-                    publisher="PaddlePaddle",
-                    download_count=downloads
-                ))
-
-            except Exception as e:
-                print(f"处理 {model_link} 时失败，原因：{e}")
-                continue
-
-            if progress_callback:
-                progress_callback(idx, discovered_total=total_models)
-
-        driver.quit()
+        try:
+            with no_implicit(driver):
+                for idx, model_link in links:
+                    print(f"[鲸智] 正在处理 {idx}/{len(CAICT_MODEL_LINKS)}：{model_link}")
+
+                    try:
+                        driver.get(model_link)
+
+                        model_name = wait.until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR,
+                                "#community-app > div > div:nth-child(2) > "
+                                "div.w-full.bg-\\[\\#FCFCFD\\].pt-9.pb-\\[60px\\].xl\\:px-10.md\\:px-0.md\\:pb-6.md\\:h-auto > "
+                                "div > div.flex.flex-col.gap-\\[16px\\].flex-wrap.mb-\\[8px\\].text-lg.text-\\[\\#606266\\]."
+                                "font-semibold.md\\:px-5 > div > a"))
+                        ).text.strip()
+
+                        downloads = wait.until(
+                            EC.presence_of_element_located((By.CSS_SELECTOR,
+                                "#pane-summary > div > div.w-\\[40\\%\\].sm\\:w-\\[100\\%\\].border-l.border-\\[\\#EBEEF5\\]."
+                                "md\\:border-l-0.md\\:border-b.md\\:w-full.md\\:pl-0 > div > "
+                                "div.text-\\[\\#303133\\].text-base.font-semibold.leading-6.mt-1.md\\:pl-0"))
+                        ).text.strip().replace(',', '')
+
+                        records[idx] = self.create_record(
+                            model_name=model_name,
+                            publisher="PaddlePaddle",
+                            download_count=downloads
+                        )
+
+                    except Exception as e:
+                        print(f"处理 {model_link} 时失败，原因：{e}")
+                        continue
+
+                    done_queue.put(idx)
+        finally:
+            DRIVER_POOL.release(driver)
+
+        return records
+
+    def fetch(self, progress_callback=None, progress_total=None):
+        """抓取鲸智数据（多个 driver 并行处理链接）"""
+        total_models = len(CAICT_MODEL_LINKS)
+        workers = max(1, min(CAICT_CONCURRENCY, total_models))
+
+        # 按轮询方式把链接分给各个 driver
+        indexed_links = list(enumerate(CAICT_MODEL_LINKS, start=1))
+        chunks = [indexed_links[w::workers] for w in range(workers)]
+
+        # 工作线程只通过队列报告完成情况，进度回调在调用线程中执行：
+        # Streamlit 的进度条 / 文本组件需要脚本线程的上下文，在工作线程中调用会被静默丢弃
+        done_queue = Queue()
+        records = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._scrape_links, chunk, done_queue) for chunk in chunks]
+            for future in futures:
+                # 无论成功与否，每个 driver 结束时放入一个 None 作为结束标记
+                future.add_done_callback(lambda _: done_queue.put(None))
+
+            completed = 0
+            finished_workers = 0
+            while finished_workers < workers:
+                if done_queue.get() is None:
+                    finished_workers += 1
+                    continue
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, discovered_total=total_models)
+
+            for future in futures:
+                records.update(future.result())
+
+        # 保持与链接列表一致的顺序
+        self.results.extend(records[idx] for idx in sorted(records))
         return self.to_dataframe(), total_models
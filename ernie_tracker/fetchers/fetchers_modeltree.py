@@ -3,15 +3,243 @@ Model Tree 功能模块 - 获取官方模型的衍生模型
 支持获取 Finetune 和 Adapter 模型，并智能分类
 """
 from huggingface_hub import list_models, model_info
+from huggingface_hub.utils import RepositoryNotFoundError
 from datetime import date, datetime
+import ast
+import copy
+import json
+import logging
+import os
+import numpy as np
 import pandas as pd
 import time
 import re
-from typing import List, Dict, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 from ..db import save_to_db, get_last_model_count, update_last_model_count
-from ..config import DB_PATH
+from ..config import (
+    DB_PATH, HF_LISTING_CONCURRENCY, HF_MODEL_INFO_CONCURRENCY, HF_RETRY_ATTEMPTS, HF_RETRY_BASE_DELAY,
+    SERIES_TO_CATEGORY
+)
 
+logger = logging.getLogger(__name__)
 
+
+def _parallel_map(func, items, max_workers: int = HF_MODEL_INFO_CONCURRENCY) -> List:
+    """
+    用线程池并发执行 func（用于 model_info 等网络请求），按输入顺序返回结果
+
+    Args:
+        func: 单个元素的处理函数（需自行处理异常）
+        items: 待处理元素
+        max_workers: 最大并发数
+
+    Returns:
+        List: 与 items 一一对应的结果列表
+    """
+    items = list(items)
+    if not items:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def _is_transient_hf_error(error: Exception) -> bool:
+    """
+    判断 Hugging Face 请求错误是否值得重试（429 限流、5xx、连接/超时等网络错误）
+
+    404 等客户端错误直接返回 False（例如验证模型是否存在时不应重试）
+    """
+    status_code = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status_code is not None:
+        return status_code == 429 or status_code >= 500
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # huggingface_hub 底层可能是 httpx 或 requests，按异常类名识别网络层错误
+    return any(cls.__name__ in ('TransportError', 'ConnectionError', 'Timeout')
+               for cls in type(error).__mro__)
+
+
+def _call_with_backoff(func, *args, **kwargs):
+    """
+    调用 func，遇到可重试的错误时按指数退避重试（1s, 2s, 4s, ...）
+
+    Returns:
+        func 的返回值（重试耗尽或不可重试时抛出最后一次的异常）
+    """
+    for attempt in range(HF_RETRY_ATTEMPTS):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if attempt == HF_RETRY_ATTEMPTS - 1 or not _is_transient_hf_error(e):
+                raise
+            time.sleep(HF_RETRY_BASE_DELAY * 2 ** attempt)
+
+
+@lru_cache(maxsize=8192)
+def _cached_model_info(model_id: str, expand: Tuple[str, ...] = None):
+    """
+    带缓存的 model_info：同一次抓取中搜索 / 官方列表 / Model Tree / 补充搜索
+    会多次命中同一模型，缓存后每个 (model_id, expand) 只请求一次
+
+    注意：缓存仅在单次抓取内有效，get_all_ernie_derivatives 开始时会清空，
+    避免长驻进程（Streamlit）返回过期的下载量
+
+    Args:
+        model_id: 模型ID
+        expand: 需要展开的字段（tuple，便于作为缓存键），None 表示基础信息
+
+    Returns:
+        ModelInfo: huggingface_hub 返回的模型信息（限流/网络错误会退避重试；最终失败时抛出异常，不缓存）
+    """
+    if expand:
+        return _call_with_backoff(model_info, model_id, expand=list(expand))
+    return _call_with_backoff(model_info, model_id)
+
+
+def _compile_keywords(keywords) -> re.Pattern:
+    """把关键词列表编译为一个字面量交替正则（一次扫描完成所有子串匹配）"""
+    return re.compile('|'.join(re.escape(k) for k in keywords))
+
+
+# 名称兜底分类关键词：按优先级排列
+_NAME_FALLBACK_KEYWORDS = [
+    ('quantized', [
+        # 格式标识
+        '-gguf', '.gguf', 'gguf', '-gptq', '-awq', '-exl2',
+        # 量化位数 - 通用格式
+        '-4bit', '-8bit', '-6bit', '-2bit',
+        'int2', 'int4', 'int8',
+        # Q系列量化
+        '-q1_', '-q2_', '-q3_', '-q4_', '-q5_', '-q6_', '-q8_',
+        'q1_', 'q2_', 'q3_', 'q4_', 'q5_', 'q6_', 'q8_',
+        # 精度格式（仅保留 fp8，移除 bf16/fp16 以免误判）
+        'fp8',
+        # W/A量化格式
+        'w4a8', 'w4a16', 'w2a8', 'w8a8', 'w4a4',
+        # MLX格式
+        'mlx-4bit', 'mlx-8bit', 'mlx-6bit',
+        # 其他标识
+        '-quantized', '_quantized', 'quantized'
+    ]),
+    ('lora', ['lora', 'low-rank-adaptation', 'low-rank']),
+    ('adapter', ['adapter', 'adapters', 'peft', 'prefix-tuning', 'prompt-tuning']),
+    ('merge', ['-merge', '_merge', '-merged', '_merged']),
+    ('finetune', [
+        'finetune', 'fine-tune', 'fine-tuned', 'finetuned',
+        'custom-trained', 'custom-trained-model', 'trained-on'
+    ]),
+    # 官方原始模型
+    ('original', ['baidu/', 'paddlepaddle/']),
+]
+
+# 合并为一个锚定正则：每个命名分组是对整串的前瞻，按顺序尝试，
+# 第一个命中的分组即优先级最高的类别（一次 match 调用完成全部判断）
+_NAME_FALLBACK_RE = re.compile(
+    '^(?:' + '|'.join(
+        f"(?P<{model_type}>(?=.*?(?:{'|'.join(re.escape(k) for k in keywords)})))"
+        for model_type, keywords in _NAME_FALLBACK_KEYWORDS
+    ) + ')',
+    re.DOTALL
+)
+
+# list_models 需要展开的字段：一次分页请求带回 downloadsAllTime、模型卡等，免去逐个 model_info
+# （expand 不能与 full / cardData 参数同时使用）
+_HF_LIST_EXPAND = [
+    'author', 'cardData', 'createdAt', 'downloadsAllTime', 'lastModified',
+    'library_name', 'likes', 'pipeline_tag', 'tags',
+]
+
+# Hugging Face Model Tree 记录的列顺序（与 add_record 中的字段一致）
+_HF_RECORD_COLUMNS = [
+    'date', 'repo', 'model_name', 'publisher', 'download_count', 'model_category',
+    'model_type', 'is_derivative', 'base_model', 'data_source', 'tags', 'likes',
+    'library_name', 'pipeline_tag', 'created_at', 'last_modified', 'fetched_at',
+    'base_model_from_api', 'url',
+]
+
+# ModelScope / AI Studio Model Tree 记录的列顺序（与各自构建 record 的字段一致）
+_MODELSCOPE_RECORD_COLUMNS = [
+    'date', 'repo', 'model_name', 'publisher', 'download_count', 'model_category',
+    'model_type', 'base_model', 'data_source', 'tags', 'likes', 'library_name',
+    'pipeline_tag', 'created_at', 'last_modified', 'fetched_at', 'base_model_from_api',
+    'search_keyword',
+]
+_AISTUDIO_RECORD_COLUMNS = [
+    'date', 'repo', 'model_name', 'publisher', 'download_count', 'model_category',
+    'model_type', 'base_model', 'data_source', 'search_keyword', 'url', 'last_modified',
+]
+
+# update_ernie_model_tree 在 platform_stats 中记录模型数量使用的平台名
+_MODEL_TREE_STATS_PLATFORM = 'Hugging Face Model Tree'
+
+# Model Tree 抓取写入的 data_source；其中 search 也会由普通 Hugging Face 搜索写入
+_MODEL_TREE_SOURCES = ('original', 'model_tree', 'both', 'search')
+_MODEL_TREE_ONLY_SOURCES = ('original', 'model_tree', 'both')
+
+# 文本中的模型ID（owner/name）
+_MODEL_ID_RE = re.compile(r'[a-zA-Z0-9_-]+/[a-zA-Z0-9_-]+')
+
+# Model Tree 页面上的衍生模型数量（ModelScope：“共N个模型”；AI Studio：数字）
+_MODELSCOPE_TREE_COUNT_RE = re.compile(r'共(\d+)个模型')
+_AISTUDIO_TREE_COUNT_RE = re.compile(r'(\d+)')
+
+# PaddleOCR-VL 系列：同时包含 paddleocr 与 vl（忽略大小写，任意顺序）
+_PADDLEOCR_VL_RE = re.compile(r'paddleocr.*vl|vl.*paddleocr', re.IGNORECASE | re.DOTALL)
+
+# ERNIE / PaddleOCR 相关模型名称（忽略大小写）
+_ERNIE_NAME_RE = re.compile(r'ernie|paddleocr', re.IGNORECASE)
+
+# 官方账号前缀
+_OFFICIAL_RE = _compile_keywords(['baidu/', 'paddlepaddle/'])
+
+# PEFT 标签信号
+_PEFT_RE = _compile_keywords(['peft', 'prefix-tuning', 'prompt-tuning', 'adapter'])
+
+# base_model 标签中带的模型类型（HF 结构化标签，如 base_model:quantized:xxx）
+_BM_TAG_TYPES = ('quantized', 'adapter', 'lora', 'merge', 'finetune')
+
+# 在以换行拼接的标签文本上一次扫描：第一个命中的行即第一个带类型前缀的 base_model 标签
+_BM_PREFIX_RE = re.compile('^base_model:(' + '|'.join(_BM_TAG_TYPES) + '):', re.MULTILINE)
+_BASE_MODEL_TAG_RE = re.compile('^base_model:', re.MULTILINE)
+
+# 官方发布账号
+_OFFICIAL_AUTHORS = frozenset({'baidu', 'PaddlePaddle'})
+
+# is_derivative_model 使用的衍生标签
+_DERIVATIVE_TAGS = frozenset({'fine-tuned', 'adapter', 'lora', 'peft'})
+
+# 模型卡字段（_classify_by_card_data 使用）
+_CARD_QUANT_KEYS = frozenset({
+    'quantization_config', 'quantization', 'quantization_bits',
+    'load_in_4bit', 'load_in_8bit', 'bnb_4bit_quant_type', 'gguf'
+})
+_CARD_LORA_KEYS = frozenset({'lora_alpha', 'lora_r', 'lora_dropout'})
+_CARD_ADAPTER_KEYS = frozenset({'adapters', 'adapter', 'adapter_config', 'adapter_name'})
+_CARD_MERGE_KEYS = frozenset({'merge_method', 'merging_config', 'merge_config', 'merged_by'})
+_CARD_FINETUNE_KEYS = frozenset({'finetuning_type', 'finetuning_config', 'finetune_config'})
+_CARD_CLASSIFY_KEYS = (
+    _CARD_QUANT_KEYS | _CARD_LORA_KEYS | _CARD_ADAPTER_KEYS | _CARD_MERGE_KEYS | _CARD_FINETUNE_KEYS
+)
+
+
+@lru_cache(maxsize=256)
+def _derivative_name_re(base_name: str) -> re.Pattern:
+    """按基座名编译衍生模型名称模式（同一基座只编译一次）"""
+    return _compile_keywords([
+        f"{base_name}-",
+        f"-{base_name}",
+        f"finetuned-{base_name}",
+        f"{base_name}-finetune",
+        f"adapter-{base_name}",
+        f"{base_name}-adapter",
+        f"lora-{base_name}",
+        f"{base_name}-lora"
+    ])
+
+
+@lru_cache(maxsize=8192)
 def classify_model(model_name: str, publisher: str, base_model: str = None) -> str:
     """
     智能分类模型
@@ -27,21 +255,16 @@ def classify_model(model_name: str, publisher: str, base_model: str = None) -> s
     """
     仅返回两类：ernie-4.5 或 paddleocr-vl。其余一律归入 ernie-4.5（避免出现 other/other-ernie）。
     """
-    def _is_paddleocr(name: str) -> bool:
-        n = name.lower()
-        return 'paddleocr' in n and 'vl' in n
-
-    base_lower = base_model.lower() if base_model else ''
-    name_lower = model_name.lower()
-
-    if _is_paddleocr(base_lower) or _is_paddleocr(name_lower):
+    # 名称或基座同时包含 paddleocr 与 vl（不区分大小写、不限顺序）
+    if _PADDLEOCR_VL_RE.search(model_name) or (base_model and _PADDLEOCR_VL_RE.search(base_model)):
         return 'paddleocr-vl'
 
     # 默认归入 ernie-4.5
     return 'ernie-4.5'
 
 
-def classify_model_type(model_name: str, tags: list, pipeline_tag: str = None, card_data: dict = None) -> str:
+def classify_model_type(model_name: str, tags: list, pipeline_tag: str = None, card_data: dict = None,
+                        tags_lower: Tuple[str, ...] = None) -> str:
     """
     识别模型类型，优先使用结构化信息（HF 标签 / 模型卡），最后再名称兜底
 
@@ -50,6 +273,7 @@ def classify_model_type(model_name: str, tags: list, pipeline_tag: str = None, c
         tags: 模型标签列表（来自HuggingFace API）
         pipeline_tag: pipeline标签
         card_data: 模型卡的元信息（如果可用）
+        tags_lower: 已小写化的标签（调用方已计算时传入，避免重复转换）
 
     Returns:
         str: 模型类型
@@ -61,60 +285,88 @@ def classify_model_type(model_name: str, tags: list, pipeline_tag: str = None, c
         - 'original': 官方原始模型
         - 'other': 其他
     """
+    # 标签拼成一段文本，各关键词正则只扫描一次（标签本身不含换行）
+    if tags_lower is None:
+        tags_lower = [tag.lower() for tag in tags] if tags else []
+    tags_text = '\n'.join(tags_lower)
+
+    # 模型卡不可哈希，有模型卡时按顺序直接计算：标签 -> 模型卡 -> 名称
     card_data_dict = card_data if isinstance(card_data, dict) else None
+    if card_data_dict:
+        tag_type = _classify_by_tags(tags_text)
+        if tag_type:
+            return tag_type
+
+        # 3) 模型卡：仅使用常见、固定字段
+        card_type = _classify_by_card_data(card_data_dict)
+        if card_type != 'other':
+            return card_type
+
+        return _classify_by_name(model_name, tags_text)
+
+    # 没有模型卡时结果只取决于名称和标签，同一模型在搜索 / 官方 / Model Tree 多条路径中只计算一次
+    return _classify_model_type_cached(model_name, tags_text)
+
+
+@lru_cache(maxsize=8192)
+def _classify_model_type_cached(model_name: str, tags_text: str) -> str:
+    """classify_model_type 在没有模型卡时的结果（按名称和标签文本缓存）"""
+    return _classify_by_tags(tags_text) or _classify_by_name(model_name, tags_text)
+
+
+def _classify_by_tags(tags_text: str) -> Optional[str]:
+    """
+    基于 HF 标签分类（结构化信息，优先级最高）
+
+    Args:
+        tags_text: 以换行拼接的小写标签
 
+    Returns:
+        str: 模型类型，标签无法判断时返回 None
+    """
     # 1) 标签：结构化、优先级最高
-    tags_lower = [tag.lower() for tag in tags] if tags else []
-    for tag in tags_lower:
-        if tag.startswith('base_model:quantized:'):
-            return 'quantized'
-        if tag.startswith('base_model:adapter:'):
-            return 'adapter'
-        if tag.startswith('base_model:lora:'):
-            return 'lora'
-        if tag.startswith('base_model:merge:'):
-            return 'merge'
-        if tag.startswith('base_model:finetune:'):
-            return 'finetune'
+    match = _BM_PREFIX_RE.search(tags_text)
+    if match:
+        return match.group(1)
 
     # 2) 标签：PEFT 信号
-    peft_indicators = ['peft', 'prefix-tuning', 'prompt-tuning', 'adapter']
-    if tags_lower and any(indicator in ' '.join(tags_lower) for indicator in peft_indicators):
-        if any('lora' in tag for tag in tags_lower):
+    if _PEFT_RE.search(tags_text):
+        if 'lora' in tags_text:
             return 'lora'
         return 'adapter'
 
-    # 3) 模型卡：仅使用常见、固定字段
-    if card_data_dict:
-        card_type = _classify_by_card_data(card_data_dict)
-        if card_type != 'other':
-            return card_type
+    return None
+
+
+def _classify_by_name(model_name: str, tags_text: str) -> str:
+    """
+    基于模型名称分类：官方原始模型判断 + 名称关键词兜底
+
+    Args:
+        model_name: 模型名称
+        tags_text: 以换行拼接的小写标签
 
+    Returns:
+        str: 模型类型
+    """
     # 4) 官方原始模型（无 base_model 标签）
-    official_patterns = ['baidu/', 'paddlepaddle/']
-    model_name_lower = model_name.lower()
-    if any(pattern in model_name_lower for pattern in official_patterns):
-        if not any(tag.startswith('base_model:') for tag in tags_lower):
+    if _OFFICIAL_RE.search(model_name.lower()):
+        if not _BASE_MODEL_TAG_RE.search(tags_text):
             return 'original'
 
     # 5) 名称兜底（最不可靠）
-    name_based_type = _classify_by_name_fallback(model_name)
-    if name_based_type != 'other':
-        return name_based_type
-
-    return 'other'
+    return _classify_by_name_fallback(model_name)
 
 
 def _classify_by_card_data(card_data: dict) -> str:
     """
     基于模型卡的字段进行分类（优先级最高）
     """
+    # 模型卡中与分类相关的字段只求一次交集，后续各类别只在这个小集合上判断
+    present = _CARD_CLASSIFY_KEYS.intersection(card_data)
+
     # 量化相关字段
-    quant_keys = [
-        'quantization_config', 'quantization', 'quantization_bits',
-        'load_in_4bit', 'load_in_8bit', 'bnb_4bit_quant_type', 'gguf'
-    ]
-    if any(key in card_data for key in quant_keys):
+    if not _CARD_QUANT_KEYS.isdisjoint(present):
         return 'quantized'
 
     # PEFT / LoRA
@@ -124,86 +376,82 @@ def _classify_by_card_data(card_data: dict) -> str:
     if peft_type:
         return 'adapter'
 
-    if any(key in card_data for key in ['lora_alpha', 'lora_r', 'lora_dropout']):
+    if not present:
+        return 'other'
+    if not _CARD_LORA_KEYS.isdisjoint(present):
         return 'lora'
-    if any(key in card_data for key in ['adapters', 'adapter', 'adapter_config', 'adapter_name']):
+    if not _CARD_ADAPTER_KEYS.isdisjoint(present):
         return 'adapter'
 
     # 合并模型
-    if any(key in card_data for key in ['merge_method', 'merging_config', 'merge_config', 'merged_by']):
+    if not _CARD_MERGE_KEYS.isdisjoint(present):
         return 'merge'
 
     # 明确的微调配置字段
-    finetune_keys = ['finetuning_type', 'finetuning_config', 'finetune_config']
-    if any(key in card_data for key in finetune_keys):
+    if not _CARD_FINETUNE_KEYS.isdisjoint(present):
         return 'finetune'
 
     return 'other'
 
 
+@lru_cache(maxsize=8192)
 def _classify_by_name_fallback(model_name: str) -> str:
     """
     回退方案：基于模型名称进行分类（当没有标签信息时）
 
+    同一名称会在 _needs_card 与 classify_model_type 中各判断一次，按名称缓存结果
+
     Args:
         model_name: 模型名称
 
     Returns:
         str: 模型类型
     """
-    model_name_lower = model_name.lower()
+    # 优先级：quantized > lora > adapter > merge > finetune > original
+    match = _NAME_FALLBACK_RE.match(model_name.lower())
+    return match.lastgroup if match else 'other'
 
-    # Quantized 相关关键词（优先级最高）
-    quantized_keywords = [
-        # 格式标识
-        '-gguf', '.gguf', 'gguf', '-gptq', '-awq', '-exl2',
-        # 量化位数 - 通用格式
-        '-4bit', '-8bit', '-6bit', '-2bit',
-        'int2', 'int4', 'int8',
-        # Q系列量化
-        '-q1_', '-q2_', '-q3_', '-q4_', '-q5_', '-q6_', '-q8_',
-        'q1_', 'q2_', 'q3_', 'q4_', 'q5_', 'q6_', 'q8_',
-        # 精度格式（仅保留 fp8，移除 bf16/fp16 以免误判）
-        'fp8',
-        # W/A量化格式
-        'w4a8', 'w4a16', 'w2a8', 'w8a8', 'w4a4',
-        # MLX格式
-        'mlx-4bit', 'mlx-8bit', 'mlx-6bit',
-        # 其他标识
-        '-quantized', '_quantized', 'quantized'
-    ]
-    if any(keyword in model_name_lower for keyword in quantized_keywords):
-        return 'quantized'
 
-    # LoRA 相关关键词
-    lora_keywords = ['lora', 'low-rank-adaptation', 'low-rank']
-    if any(keyword in model_name_lower for keyword in lora_keywords):
-        return 'lora'
+def _index_tags(tags: list) -> Tuple[Tuple[str, ...], Optional[str]]:
+    """
+    一次遍历标签，同时得到小写标签和标签中声明的 base_model
 
-    # Adapter 相关关键词
-    adapter_keywords = ['adapter', 'adapters', 'peft', 'prefix-tuning', 'prompt-tuning']
-    if any(keyword in model_name_lower for keyword in adapter_keywords):
-        return 'adapter'
+    Args:
+        tags: 模型标签列表
 
-    # Merge 相关关键词
-    merge_keywords = ['-merge', '_merge', '-merged', '_merged']
-    if any(keyword in model_name_lower for keyword in merge_keywords):
-        return 'merge'
+    Returns:
+        Tuple: (小写标签, base_model)；base_model 取第一个有效的
+        base_model:ModelID 或 base_model:type:ModelID 标签，没有时为 None
+    """
+    tags_lower = []
+    base_model = None
+    for tag in tags:
+        tags_lower.append(tag.lower())
+        if base_model is None and tag.startswith('base_model:'):
+            # 取最后一部分作为 model ID（最多分割成3部分），需包含 / 才是有效的 model ID
+            candidate = tag.split(':', 2)[-1]
+            if '/' in candidate and not candidate.startswith('license:'):
+                base_model = candidate
+    return tuple(tags_lower), base_model
+
+
+def _needs_card(tags_lower, model_name: str) -> bool:
+    """
+    判断是否需要额外请求模型卡来分类
 
-    # Finetune 相关关键词
-    finetune_keywords = [
-        'finetune', 'fine-tune', 'fine-tuned', 'finetuned',
-        'custom-trained', 'custom-trained-model', 'trained-on'
-    ]
-    if any(keyword in model_name_lower for keyword in finetune_keywords):
-        return 'finetune'
+    仅当没有 base_model / PEFT 标签、名称兜底也无法判断（结果为 'other'）时才需要
 
-    # 检查是否为官方原始模型
-    official_patterns = ['baidu/', 'paddlepaddle/']
-    if any(pattern in model_name_lower for pattern in official_patterns):
-        return 'original'
+    Args:
+        tags_lower: 已小写化的标签
+        model_name: 模型名称（完整ID）
 
-    return 'other'
+    Returns:
+        bool: 是否需要请求 cardData
+    """
+    tags_text = '\n'.join(tags_lower)
+    if _BASE_MODEL_TAG_RE.search(tags_text) or _PEFT_RE.search(tags_text):
+        return False
+    return _classify_by_name_fallback(model_name) == 'other'
 
 
 def get_model_tree_children(base_model_id: str, max_depth: int = 1) -> List[Dict]:
@@ -220,7 +468,7 @@ def get_model_tree_children(base_model_id: str, max_depth: int = 1) -> List[Dict
     try:
         # 验证基础模型存在
         try:
-            base_info = model_info(base_model_id)
+            base_info = _cached_model_info(base_model_id)
             print(f"📊 获取 {base_model_id} 的model tree...")
         except Exception as e:
             print(f"⚠️ 基础模型 {base_model_id} 不存在或无法访问: {e}")
@@ -231,7 +479,7 @@ def get_model_tree_children(base_model_id: str, max_depth: int = 1) -> List[Dict
         try:
             derivatives = list(list_models(
                 filter=f"base_model:{base_model_id}",
-                full=True,
+                expand=_HF_LIST_EXPAND,
                 limit=1000  # 增加限制以获取所有衍生模型
             ))
 
@@ -241,40 +489,37 @@ def get_model_tree_children(base_model_id: str, max_depth: int = 1) -> List[Dict
 
             print(f"  ✅ 找到 {len(derivatives)} 个衍生模型")
 
-            # 转换为标准格式
-            related_models = []
-            for deriv in derivatives:
+            # 转换为标准格式（并发获取详情，重叠网络等待）
+            def build_model_data(deriv):
                 try:
-                    # 第一次调用：不带expand，获取created_at等基础字段
-                    deriv_basic = model_info(deriv.id)
-
-                    # 第二次调用：带expand，获取downloadsAllTime
-                    deriv_info = model_info(deriv.id, expand=["downloadsAllTime"])
-
-                    # 将created_at从basic对象复制到expand对象
-                    if hasattr(deriv_basic, 'created_at') and not getattr(deriv_info, 'created_at', None):
-                        deriv_info.created_at = deriv_basic.created_at
-                    if hasattr(deriv_basic, 'last_modified') and not getattr(deriv_info, 'last_modified', None):
-                        deriv_info.last_modified = deriv_basic.last_modified
-
-                    # 获取下载量 - 优先使用 downloads_all_time，回退到 downloads
-                    downloads = getattr(deriv_info, 'downloads_all_time', None) or getattr(deriv_info, 'downloads', 0) or 0
-
-                    model_data = {
+                    # tags / 时间戳等字段 list_models 已返回，只有 downloadsAllTime 需要单独请求
+                    downloads_all_time = getattr(deriv, 'downloads_all_time', None)
+                    if downloads_all_time is None:
+                        deriv_info = _cached_model_info(deriv.id, ("downloadsAllTime",))
+                        downloads_all_time = getattr(deriv_info, 'downloads_all_time', None)
+                        # 获取下载量 - 优先使用 downloads_all_time，回退到 downloads
+                        downloads = downloads_all_time or getattr(deriv_info, 'downloads', 0) or 0
+                    else:
+                        downloads = downloads_all_time or 0
+
+                    return {
                         'id': deriv.id,
                         'author': deriv.author or 'Unknown',
                         'tags': getattr(deriv, 'tags', []),  # 🔧 修复：从 deriv 获取 tags（deriv_info.tags 为 None）
                         'downloads': downloads,
+                        'downloads_all_time': downloads_all_time,
                         'pipeline_tag': getattr(deriv, 'pipeline_tag', None),  # 🔧 修复：从 deriv 获取
                         'created_at': getattr(deriv, 'created_at', None),
                         'last_modified': getattr(deriv, 'last_modified', None),
-                        'likes': getattr(deriv, 'likes', 0)
+                        'likes': getattr(deriv, 'likes', 0),
+                        'card_data': getattr(deriv, 'card_data', None)
                     }
-                    related_models.append(model_data)
 
                 except Exception as e:
                     print(f"    ⚠️ 获取 {deriv.id} 详情失败: {e}")
-                    continue
+                    return None
+
+            related_models = [m for m in _parallel_map(build_model_data, derivatives) if m is not None]
 
             print(f"  ✅ 成功处理 {len(related_models)} 个衍生模型")
             return related_models
@@ -288,61 +533,108 @@ def get_model_tree_children(base_model_id: str, max_depth: int = 1) -> List[Dict
         return []
 
 
+def _iter_strings(obj):
+    """
+    深度优先逐个产出嵌套 dict / list 中的字符串（显式栈，不构造中间列表）
+
+    Args:
+        obj: 模型卡数据（str / dict / list 任意嵌套）
+
+    Yields:
+        str: 文本内容，顺序与递归遍历一致
+    """
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, dict):
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+
+
+def _model_exists(model_id: str) -> bool:
+    """
+    模型是否存在
+
+    Args:
+        model_id: 模型ID
+
+    Returns:
+        bool: model_info 请求成功时为 True；模型不存在或请求失败时为 False
+    """
+    try:
+        return _model_exists_cached(model_id)
+    except Exception:
+        # 429 / 5xx / 网络异常等临时错误不缓存，下次重新请求
+        return False
+
+
+@lru_cache(maxsize=8192)
+def _model_exists_cached(model_id: str) -> bool:
+    """
+    _model_exists 的缓存层：只缓存明确的结果（存在 / RepositoryNotFoundError），其他异常直接抛出，不会被缓存
+    """
+    try:
+        _cached_model_info(model_id)
+        return True
+    except RepositoryNotFoundError:
+        return False
+
+
 def extract_related_models_from_card(card_data: dict, base_model_id: str) -> List[str]:
     """
     从模型card中提取相关模型ID
     """
-    related_models = []
-
     if not card_data:
-        return related_models
-
-    # 递归查找所有文本内容
-    def extract_text(obj):
-        texts = []
-        if isinstance(obj, str):
-            texts.append(obj)
-        elif isinstance(obj, dict):
-            for value in obj.values():
-                texts.extend(extract_text(value))
-        elif isinstance(obj, list):
-            for item in obj:
-                texts.extend(extract_text(item))
-        return texts
-
-    all_text = extract_text(card_data)
-    combined_text = ' '.join(all_text).lower()
-
-    # 查找相关的模型引用
-    base_name = base_model_id.split('/')[-1].lower()
+        return []
 
-    # 查找模式
-    patterns = [
-        rf'{base_model_id.lower()}',
-        rf'{base_name}',
-        'based on',
-        'finetuned from',
-        'adapter for',
-        'lora for'
-    ]
+    # 从文本中提取候选模型ID（去重并保持出现顺序）；不含 '/' 的文本不可能有模型ID，跳过正则
+    candidates = list(dict.fromkeys(
+        match
+        for text in _iter_strings(card_data)
+        if '/' in text
+        for match in _MODEL_ID_RE.findall(text)
+        if match != base_model_id
+    ))
 
-    # 从文本中提取模型ID
-    import re
-    for text in all_text:
-        # 查找模型ID模式
-        model_id_pattern = r'([a-zA-Z0-9_-]+/[a-zA-Z0-9_-]+)'
-        matches = re.findall(model_id_pattern, text)
-
-        for match in matches:
-            if match != base_model_id and match not in related_models:
-                # 验证是否是有效的模型
-                try:
-                    model_info(match)  # 验证模型存在
-                    related_models.append(match)
-                except:
-                    continue
+    # 并发验证候选模型是否存在
+    return [m for m, ok in zip(candidates, _parallel_map(_model_exists, candidates)) if ok]
 
-    return related_models
+
+@lru_cache(maxsize=256)
+def _genuine_derivative_res(base_model_id: str) -> Tuple[re.Pattern, re.Pattern]:
+    """
+    按基座编译 is_genuine_derivative 使用的模型卡指标和名称模式（同一基座只构建一次）
+
+    Returns:
+        Tuple: (模型卡衍生指标正则, 名称模式正则)
+    """
+    base_id_lower = base_model_id.lower()
+    base_name = base_model_id.split('/')[-1].lower()
+
+    card_re = _compile_keywords([
+        f'based on {base_id_lower}',
+        f'finetuned from {base_id_lower}',
+        f'trained on {base_id_lower}',
+        f'adapter for {base_id_lower}',
+        f'lora adapter for {base_id_lower}',
+        f'{base_name} finetune',
+        f'{base_name} adapter',
+        f'{base_name} lora'
+    ])
+    name_re = _compile_keywords([
+        f'{base_name}-finetune',
+        f'{base_name}-adapter',
+        f'{base_name}-lora',
+        f'{base_name}-fine-tuned',
+        f'{base_name}-adapted',
+        f'finetuned-{base_name}',
+        f'adapter-{base_name}',
+        f'lora-{base_name}'
+    ])
+    return card_re, name_re
 
 
 def is_genuine_derivative(model_info, base_model_id: str) -> bool:
@@ -358,47 +650,15 @@ def is_genuine_derivative(model_info, base_model_id: str) -> bool:
     """
     try:
         # 检查模型card内容
+        card_re, name_re = _genuine_derivative_res(base_model_id)
+
+        # 检查模型card内容（明确的衍生指标）
         if hasattr(model_info, 'card_data') and model_info.card_data:
-            card_content = str(model_info.card_data).lower()
-            base_id_lower = base_model_id.lower()
-            base_name = base_model_id.split('/')[-1].lower()
-
-            # 明确的衍生指标
-            derivative_indicators = [
-                f'based on {base_id_lower}',
-                f'finetuned from {base_id_lower}',
-                f'trained on {base_id_lower}',
-                f'adapter for {base_id_lower}',
-                f'lora adapter for {base_id_lower}',
-                f'{base_name} finetune',
-                f'{base_name} adapter',
-                f'{base_name} lora'
-            ]
-
-            # 检查是否包含衍生指标
-            if any(indicator in card_content for indicator in derivative_indicators):
+            if card_re.search(str(model_info.card_data).lower()):
                 return True
 
         # 检查模型名称模式
-        model_name = model_info.modelId.lower()
-        base_name = base_model_id.split('/')[-1].lower()
-
-        # 名称模式检查
-        derivative_patterns = [
-            f'{base_name}-finetune',
-            f'{base_name}-adapter',
-            f'{base_name}-lora',
-            f'{base_name}-fine-tuned',
-            f'{base_name}-adapted',
-            f'finetuned-{base_name}',
-            f'adapter-{base_name}',
-            f'lora-{base_name}'
-        ]
-
-        if any(pattern in model_name for pattern in derivative_patterns):
-            return True
-
-        return False
+        return bool(name_re.search(model_info.modelId.lower()))
 
     except Exception:
         return False
@@ -415,30 +675,12 @@ def is_derivative_model(model, base_model_id: str) -> bool:
     Returns:
         bool: 是否为衍生模型
     """
-    model_id = model.id.lower()
+    # 名字匹配或标签匹配（名字命中时不再处理标签）
     base_name = base_model_id.split('/')[-1].lower()
-
-    # 检查模型名关系
-    derivative_patterns = [
-        f"{base_name}-",
-        f"-{base_name}",
-        f"finetuned-{base_name}",
-        f"{base_name}-finetune",
-        f"adapter-{base_name}",
-        f"{base_name}-adapter",
-        f"lora-{base_name}",
-        f"{base_name}-lora"
-    ]
-
-    # 检查标签
-    derivative_tags = ['fine-tuned', 'adapter', 'lora', 'peft']
-
-    # 名字匹配或标签匹配
-    name_match = any(pattern in model_id for pattern in derivative_patterns)
-    tag_match = (hasattr(model, 'tags') and
-                any(tag in [t.lower() for t in model.tags] for tag in derivative_tags))
-
-    return name_match or tag_match
+    if _derivative_name_re(base_name).search(model.id.lower()):
+        return True
+    return (hasattr(model, 'tags') and
+            not _DERIVATIVE_TAGS.isdisjoint(t.lower() for t in model.tags))
 
 
 def get_all_ernie_derivatives(include_paddleocr: bool = True) -> Tuple[pd.DataFrame, int]:
@@ -453,10 +695,13 @@ def get_all_ernie_derivatives(include_paddleocr: bool = True) -> Tuple[pd.DataFr
     保留 base_model_from_api，并带入更多字段（likes/library/pipeline/时间戳）。
     """
     print("🚀 开始获取ERNIE-4.5和PaddleOCR-VL模型...")
+    _cached_model_info.cache_clear()
+    _model_exists_cached.cache_clear()
 
     all_models: List[Dict] = []
-    processed_ids: Set[str] = set()
-    official_models: Dict[str, Dict] = {}
+    # model_id -> record：既用于判断是否已处理，也用于 O(1) 更新已有记录
+    id_to_record: Dict[str, Dict] = {}
+    official_models: Dict[str, str] = {}  # 官方基座 model_id -> model_category
 
     search_terms = ['ERNIE-4.5', 'PaddleOCR-VL']
 
@@ -482,37 +727,54 @@ def get_all_ernie_derivatives(include_paddleocr: bool = True) -> Tuple[pd.DataFr
             return obj.get(name)
         return getattr(obj, name, None)
 
-    def fetch_model_detail(model_id, model_obj=None):
+    def fetch_model_detail(model_id, model_obj=None, known_base_model=None):
+        # 调用方（list_models / Model Tree）已带回的字段无需再请求 model_info
+        # known_base_model：调用方已确定的基座（Model Tree / 按基座补充搜索），分类以它为准
+        created_at = _get_field(model_obj, 'created_at')
+        last_modified = _get_field(model_obj, 'last_modified')
+        downloads_all_time = _get_field(model_obj, 'downloads_all_time')
+        info = None
         try:
-            # 第一次调用：不带expand，获取created_at等基础字段
-            info_basic = model_info(model_id)
-
-            # 第二次调用：带expand，获取downloadsAllTime
-            info = model_info(model_id, expand=["downloadsAllTime"])
-
-            # 将created_at从basic对象复制到expand对象
-            if hasattr(info_basic, 'created_at') and not getattr(info, 'created_at', None):
-                info.created_at = info_basic.created_at
-            if hasattr(info_basic, 'last_modified') and not getattr(info, 'last_modified', None):
-                info.last_modified = info_basic.last_modified
-
-            # 调试：检查created_at是否成功复制
+            # 带expand，获取downloadsAllTime（注意：expand 结果只包含所请求的字段）
+            if downloads_all_time is None:
+                info = _cached_model_info(model_id, ("downloadsAllTime",))
+                downloads_all_time = getattr(info, 'downloads_all_time', None)
+
+            # 不带expand，补齐created_at等基础字段
+            if not created_at or not last_modified:
+                info_basic = _cached_model_info(model_id)
+                created_at = created_at or getattr(info_basic, 'created_at', None)
+                last_modified = last_modified or getattr(info_basic, 'last_modified', None)
+
+            # 调试：检查created_at是否成功获取
             if model_id == 'baidu/ERNIE-4.5-0.3B-PT':
                 print(f"  调试 {model_id}:")
-                print(f"    - created_at (after copy): {getattr(info, 'created_at', None)}")
-                print(f"    - downloads_all_time: {getattr(info, 'downloads_all_time', None)}")
+                print(f"    - created_at: {created_at}")
+                print(f"    - downloads_all_time: {downloads_all_time}")
         except Exception as e:
             print(f"  ⚠️ 获取 {model_id} 详情失败: {e}")
             return None
 
-        card_data = None
-        if hasattr(info, 'cardData') and info.cardData:
-            if isinstance(info.cardData, dict):
-                card_data = info.cardData
-            elif hasattr(info.cardData, '__dict__'):
-                card_data = info.cardData.__dict__
-
         tags = normalize_tags(_get_field(model_obj, 'tags') or getattr(info, 'tags', None))
+        tags_lower, base_from_tags = _index_tags(tags)
+
+        # 模型卡只在标签和名称都无法判断类型时使用；list_models 已展开 cardData，
+        # 只有没有列表对象时才单独请求
+        card_data = None
+        if _needs_card(tags_lower, model_id):
+            try:
+                if model_obj is not None:
+                    raw_card = _get_field(model_obj, 'card_data')
+                else:
+                    card_info = _cached_model_info(model_id, ("cardData",))
+                    raw_card = getattr(card_info, 'cardData', None)
+                if raw_card:
+                    if isinstance(raw_card, dict):
+                        card_data = raw_card
+                    elif hasattr(raw_card, '__dict__'):
+                        card_data = raw_card.__dict__
+            except Exception as e:
+                print(f"  ⚠️ 获取 {model_id} 模型卡失败: {e}")
         pipeline_tag = _get_field(model_obj, 'pipeline_tag') or getattr(info, 'pipeline_tag', None)
         # Hugging Face 某些新模型的 author 字段可能为空，回退到 repo owner（ID 前缀）
         publisher = (
@@ -521,31 +783,17 @@ def get_all_ernie_derivatives(include_paddleocr: bool = True) -> Tuple[pd.DataFr
             or (model_id.split('/')[0] if '/' in model_id else 'Unknown')
         )
         downloads = (
-            getattr(info, 'downloads_all_time', None)
+            downloads_all_time
             or getattr(info, 'downloads', 0)
             or _get_field(model_obj, 'downloads')
             or 0
         )
 
-        base_from_api = parse_base_from_card(card_data)
-
-        # 如果 cardData 中没有 base_model，尝试从 tags 中提取
-        if not base_from_api and tags:
-            for tag in tags:
-                if isinstance(tag, str) and tag.startswith('base_model:'):
-                    # 提取 base_model，格式如: base_model:PaddlePaddle/PaddleOCR-VL
-                    # 或 base_model:adapter:PaddlePaddle/PaddleOCR-VL
-                    parts = tag.split(':', 2)  # 最多分割成3部分
-                    if len(parts) >= 2:
-                        # base_model:ModelID 或 base_model:type:ModelID
-                        candidate = parts[-1]  # 取最后一部分作为 model ID
-                        # 验证是否是有效的 model ID 格式 (包含 /)
-                        if '/' in candidate and not candidate.startswith('license:'):
-                            base_from_api = candidate
-                            break
-
-        model_category = classify_model(model_id, publisher, base_from_api)
-        model_type = classify_model_type(model_id, tags, pipeline_tag, card_data)
+        # cardData 中没有 base_model 时使用从 tags 中提取的结果
+        base_from_api = parse_base_from_card(card_data) or base_from_tags
+
+        model_category = classify_model(model_id, publisher, known_base_model or base_from_api)
+        model_type = classify_model_type(model_id, tags, pipeline_tag, card_data, tags_lower=tags_lower)
 
         return {
             'model_id': model_id,
@@ -553,33 +801,34 @@ def get_all_ernie_derivatives(include_paddleocr: bool = True) -> Tuple[pd.DataFr
             'downloads': downloads,
             'tags': tags,
             'pipeline_tag': pipeline_tag,
-            'likes': getattr(info, 'likes', None),
-            'library_name': getattr(info, 'library_name', None),
-            'created_at': getattr(info, 'created_at', None),
-            'last_modified': getattr(info, 'last_modified', None),
+            'likes': getattr(info, 'likes', None) or _get_field(model_obj, 'likes'),
+            'library_name': getattr(info, 'library_name', None) or _get_field(model_obj, 'library_name'),
+            'created_at': created_at,
+            'last_modified': last_modified,
             'card_data': card_data,
             'model_category': model_category,
             'model_type': model_type,
             'base_model_from_api': base_from_api,
         }
 
-    def search_models_with_keyword(keyword: str, exclude_ids: Set[str]) -> List:
+    def search_models_with_keyword(keyword: str) -> List:
         try:
             results = list(list_models(
                 search=keyword,
-                full=True,
+                expand=_HF_LIST_EXPAND,
                 limit=600,
                 sort="downloads",
                 direction=-1
             ))
-            filtered = [m for m in results if m.id not in exclude_ids]
-            print(f"  🔍 搜索 '{keyword}'：{len(results)} 条，去重后 {len(filtered)} 条")
-            return filtered
+            print(f"  🔍 搜索 '{keyword}'：{len(results)} 条")
+            return results
         except Exception as e:
             print(f"  ⚠️ 搜索 '{keyword}' 失败: {e}")
             return []
 
-    allowed_categories = {'ernie-4.5', 'paddleocr-vl'}
+    # 目标系列（不含 PaddleOCR-VL 时直接从集合中排除），整个抓取过程只计算一次
+    allowed_categories = {'ernie-4.5', 'paddleocr-vl'} if include_paddleocr else {'ernie-4.5'}
+    today_iso = date.today().isoformat()
 
     def add_record(detail: Dict, data_source: str, base_model: str = None, is_original: bool = False):
         if detail is None:
@@ -593,11 +842,9 @@ def get_all_ernie_derivatives(include_paddleocr: bool = True) -> Tuple[pd.DataFr
         # 仅保留目标系列
         if model_category not in allowed_categories:
             return
-        if not include_paddleocr and model_category == 'paddleocr-vl':
-            return
 
         record = {
-            'date': date.today().isoformat(),
+            'date': today_iso,
             'repo': 'Hugging Face',
             'model_name': model_name,
             'publisher': publisher,
@@ -607,7 +854,8 @@ def get_all_ernie_derivatives(include_paddleocr: bool = True) -> Tuple[pd.DataFr
             'is_derivative': bool(base_model_val),
             'base_model': base_model_val,
             'data_source': data_source,
-            'tags': detail['tags'],
+            # tags 在建记录时就转为字符串（入库格式），DataFrame 构建后无需再逐行转换
+            'tags': repr(detail['tags']) if isinstance(detail['tags'], list) else detail['tags'],
             'likes': detail.get('likes'),
             'library_name': detail.get('library_name'),
             'pipeline_tag': detail.get('pipeline_tag'),
@@ -618,156 +866,175 @@ def get_all_ernie_derivatives(include_paddleocr: bool = True) -> Tuple[pd.DataFr
             'url': f"https://huggingface.co/{model_id}"  # 模型详情页URL
         }
         all_models.append(record)
-        processed_ids.add(model_id)
+        id_to_record[model_id] = record
 
     # ---------- 1. 全局搜索 ----------
+    # 全局搜索与官方账号列表互不依赖，一并并发发起；官方列表结果在第 2 步使用
     print(f"\n🔍 全局搜索（{', '.join(search_terms)}）...")
-    all_search_models = []
-    for search_term in search_terms:
-        all_search_models.extend(search_models_with_keyword(search_term, exclude_ids=set()))
+    with ThreadPoolExecutor(max_workers=len(search_terms) + 2) as executor:
+        search_futures = [
+            executor.submit(search_models_with_keyword, search_term)
+            for search_term in search_terms
+        ]
+        baidu_future = executor.submit(lambda: list(list_models(author="baidu", search="ERNIE-4.5", expand=_HF_LIST_EXPAND, limit=150)))
+        paddle_future = executor.submit(lambda: list(list_models(author="PaddlePaddle", search="PaddleOCR-VL", expand=_HF_LIST_EXPAND, limit=50)))
+        all_search_models = [m for future in search_futures for m in future.result()]
 
-    unique_search = {}
+    # 按 id 去重（保留首次出现的顺序），只需记录已见过的 id
+    seen_ids = set()
+    unique_search = []
     for m in all_search_models:
-        if m.id not in unique_search:
-            unique_search[m.id] = m
+        if m.id not in seen_ids:
+            seen_ids.add(m.id)
+            unique_search.append(m)
     print(f"🔍 去重后共 {len(unique_search)} 条搜索结果")
 
-    for model in unique_search.values():
-        detail = fetch_model_detail(model.id, model)
+    search_details = _parallel_map(lambda m: fetch_model_detail(m.id, m), unique_search)
+    for model, detail in zip(unique_search, search_details):
         if detail is None:
             continue
 
         add_record(detail, data_source='search')
 
-        if model.author in ['baidu', 'PaddlePaddle']:
-            official_models[model.id] = {
-                'id': model.id,
-                'category': detail['model_category']
-            }
+        if model.author in _OFFICIAL_AUTHORS:
+            official_models[model.id] = detail['model_category']
 
     # ---------- 2. 补充官方模型列表 ----------
     print("\n🌳 扩充官方模型列表...")
     try:
-        baidu_official = list(list_models(author="baidu", search="ERNIE-4.5", limit=150))
-        paddle_official = list(list_models(author="PaddlePaddle", search="PaddleOCR-VL", limit=50))
+        baidu_official = baidu_future.result()
+        paddle_official = paddle_future.result()
         print(f"  baidu 账号官方模型 {len(baidu_official)} 个；PaddlePaddle {len(paddle_official)} 个")
+        official_candidates = []
         for m in baidu_official + paddle_official:
             cat = 'paddleocr-vl' if 'paddleocr-vl' in m.id.lower() else 'ernie-4.5'
-            if not include_paddleocr and cat == 'paddleocr-vl':
-                continue
             if cat not in allowed_categories:
                 continue
-            official_models.setdefault(m.id, {'id': m.id, 'category': cat})
-            if m.id in processed_ids:
+            official_models.setdefault(m.id, cat)
+            official_candidates.append(m)
+
+        # 不在搜索结果中的官方模型一次性并发获取详情，再按列表顺序合并
+        new_official = {m.id: m for m in official_candidates if m.id not in id_to_record}
+        new_details = dict(zip(
+            new_official,
+            _parallel_map(lambda m: fetch_model_detail(m.id, m), new_official.values())
+        ))
+        for m in official_candidates:
+            rec = id_to_record.get(m.id)
+            if rec is not None:
                 # 已在搜索结果中，更新为 official
-                for rec in all_models:
-                    if f"{rec['publisher']}/{rec['model_name']}" == m.id:
-                        rec['data_source'] = 'original'
-                        rec['base_model'] = None
-                        rec['is_derivative'] = False
-                        rec['model_type'] = 'original'
-                        break
+                rec['data_source'] = 'original'
+                rec['base_model'] = None
+                rec['is_derivative'] = False
+                rec['model_type'] = 'original'
             else:
-                detail = fetch_model_detail(m.id, m)
+                detail = new_details.get(m.id)
                 if detail:
                     add_record(detail, data_source='original', base_model=None, is_original=True)
     except Exception as e:
         print(f"  ⚠️ 获取官方模型列表失败: {e}")
 
-    official_list = list(official_models.values())
+    official_list = list(official_models.items())
     print(f"🌳 官方基座数量: {len(official_list)}")
 
     # ---------- 3. 为每个官方模型查 Model Tree + 补充关键词搜索 ----------
-    for official in official_list:
-        model_id = official['id']
-        model_category = official['category']
-        print(f"\n🌳 处理基座: {model_id} ({model_category})")
-
-        # Model Tree
-        derivatives = get_model_tree_children(model_id, max_depth=1)
-        if derivatives:
-            for deriv in derivatives:
-                deriv_detail = fetch_model_detail(deriv['id'], deriv)
-                if deriv_detail is None:
-                    continue
+    # 各基座的列表请求互不依赖，先全部提交到线程池并发执行；合并仍按基座顺序串行，
+    # 记录顺序和 data_source 判定与逐个处理时一致
+    with ThreadPoolExecutor(max_workers=HF_LISTING_CONCURRENCY) as executor:
+        tree_futures = [
+            executor.submit(get_model_tree_children, model_id, 1)
+            for model_id, _ in official_list
+        ]
+        keyword_futures = [
+            executor.submit(search_models_with_keyword, model_id.split('/')[-1])
+            for model_id, _ in official_list
+        ]
+        for (model_id, model_category), tree_future, keyword_future in zip(
+            official_list, tree_futures, keyword_futures
+        ):
+            print(f"\n🌳 处理基座: {model_id} ({model_category})")
+
+            # Model Tree
+            derivatives = tree_future.result()
+            if derivatives:
+                # 只为尚未收录的衍生模型获取详情；已收录的直接更新记录
+                new_derivs = [d for d in derivatives if d['id'] not in id_to_record]
+                new_details = dict(zip(
+                    (d['id'] for d in new_derivs),
+                    _parallel_map(lambda d: fetch_model_detail(d['id'], d, model_id), new_derivs)
+                ))
+                for deriv in derivatives:
+                    existing = id_to_record.get(deriv['id'])
+                    if existing is None:
+                        deriv_detail = new_details.get(deriv['id'])
+                        if deriv_detail is None:
+                            continue
+                        add_record(deriv_detail, data_source='model_tree', base_model=model_id)
+                    else:
+                        # 更新已有记录为 both，补 base_model
+                        existing['data_source'] = 'both'
+                        existing['base_model'] = existing.get('base_model') or model_id
+                        existing['is_derivative'] = True
+                        # 🔧 修复：也要重新分类已有记录
+                        existing['model_category'] = classify_model(
+                            deriv['id'],
+                            existing['publisher'],
+                            model_id
+                        )
 
-                if deriv['id'] not in processed_ids:
-                    # 🔧 修复：使用 Model Tree 提供的 base_model 重新分类
-                    # 因为 fetch_model_detail 中的分类可能使用了错误的 base_from_api（可能为空）
-                    deriv_detail['model_category'] = classify_model(
-                        deriv['id'],
-                        deriv_detail['publisher'],
-                        model_id  # 使用 Model Tree 的 base_model，而不是 base_from_api
-                    )
-                    add_record(deriv_detail, data_source='model_tree', base_model=model_id)
-                else:
-                    # 更新已有记录为 both，补 base_model
-                    for existing in all_models:
-                        if f"{existing['publisher']}/{existing['model_name']}" == deriv['id']:
-                            existing['data_source'] = 'both'
-                            existing['base_model'] = existing.get('base_model') or model_id
-                            existing['is_derivative'] = True
-                            # 🔧 修复：也要重新分类已有记录
-                            existing['model_category'] = classify_model(
-                                deriv['id'],
-                                existing['publisher'],
-                                model_id
-                            )
-                            break
-
-        # 关键词补充搜索（按基座名）
-        base_keyword = model_id.split('/')[-1]
-        extra_results = search_models_with_keyword(base_keyword, exclude_ids=processed_ids)
-        for model in extra_results:
-            detail = fetch_model_detail(model.id, model)
-            if detail is None:
-                continue
-            # 🔧 修复：使用当前基座的 model_id 重新分类
-            # 因为这是通过基座名称搜索到的，应该与当前基座相关
-            detail['model_category'] = classify_model(
-                model.id,
-                detail['publisher'],
-                model_id  # 使用当前基座的 model_id
-            )
-            if not include_paddleocr and detail['model_category'] == 'paddleocr-vl':
-                continue
-            # 强制认为与当前 base 相关（兜底补充）
-            if model.id not in processed_ids:
-                add_record(detail, data_source='search', base_model=model_id)
-                # 若已有 base_model_from_api，保留
-                if detail.get('base_model_from_api') and not detail.get('base_model'):
-                    for rec in all_models:
-                        if rec['model_name'] == model.id.split('/')[-1] and rec['publisher'] == detail['publisher']:
+            # 关键词补充搜索（按基座名）
+            extra_results = [m for m in keyword_future.result() if m.id not in id_to_record]
+            print(f"  🔍 补充搜索去重后 {len(extra_results)} 条")
+            # 通过基座名称搜索到的模型按当前基座分类，而不是 base_from_api（可能为空或不准确）
+            extra_details = _parallel_map(lambda m: fetch_model_detail(m.id, m, model_id), extra_results)
+            for model, detail in zip(extra_results, extra_details):
+                if detail is None:
+                    continue
+                if detail['model_category'] not in allowed_categories:
+                    continue
+                # 强制认为与当前 base 相关（兜底补充）
+                if model.id not in id_to_record:
+                    add_record(detail, data_source='search', base_model=model_id)
+                    # 若已有 base_model_from_api，保留
+                    if detail.get('base_model_from_api') and not detail.get('base_model'):
+                        rec = id_to_record.get(model.id)
+                        if rec is not None:
                             rec['base_model'] = detail['base_model_from_api']
-                            break
 
     # ---------- 4. 转 DataFrame ----------
-    df = pd.DataFrame(all_models)
+    # 列已知，按固定列构建，省去逐条记录合并键集合的推断
+    df = pd.DataFrame.from_records(all_models, columns=_HF_RECORD_COLUMNS) if all_models else pd.DataFrame()
     if not df.empty:
-        if 'tags' in df.columns:
-            df['tags'] = df['tags'].apply(lambda x: str(x) if isinstance(x, list) else (x if pd.notna(x) else '[]'))
-        # 把时间字段转为字符串
-        for col in ['created_at', 'last_modified', 'fetched_at']:
-            if col in df.columns:
-                df[col] = df[col].astype(str)
+        # 把时间字段转为字符串（一次性转换所有存在的列）
+        time_cols = [col for col in ['created_at', 'last_modified', 'fetched_at'] if col in df.columns]
+        if time_cols:
+            df[time_cols] = df[time_cols].astype(str)
 
         print(f"\n📊 总计获取 {len(df)} 个模型，其中基座 {len(official_list)} 个")
 
     return df, len(all_models)
 
 
-def update_ernie_model_tree(save_to_db: bool = True) -> Tuple[pd.DataFrame, int]:
+def update_ernie_model_tree(save_to_db: bool = True, force_refresh: bool = False) -> Tuple[pd.DataFrame, int]:
     """
     更新ERNIE模型树数据（包含所有衍生模型）
 
     Args:
         save_to_db: 是否保存到数据库
+        force_refresh: 数据库中已有今天的 Model Tree 数据时是否仍重新抓取
 
     Returns:
         Tuple[DataFrame, int]: (更新的数据, 总数量)
     """
     print("🔄 开始更新ERNIE模型树数据...")
 
+    # 今天已抓取过时直接返回数据库中的结果，省去整轮 Hugging Face 请求
+    if not force_refresh:
+        today_df = _load_today_model_tree()
+        if not today_df.empty:
+            print(f"✅ 数据库中已有今天的 Model Tree 数据（{len(today_df)} 条），跳过抓取（force_refresh=True 可强制刷新）")
+            return today_df, len(today_df)
+
     # 获取所有ERNIE相关模型
     df, total_count = get_all_ernie_derivatives(include_paddleocr=True)
 
@@ -793,29 +1060,41 @@ def update_ernie_model_tree(save_to_db: bool = True) -> Tuple[pd.DataFrame, int]
         'url',  # 🔧 修复：之前遗漏了 url 字段
     ]
 
-    # 确保所有必需列都存在
+    # 必需列取已有的，可选列缺失时填充空值（一次 reindex 完成；tags / 时间字段已在
+    # get_all_ernie_derivatives 中转为字符串，这里不再重复转换）
     available_columns = [col for col in required_columns if col in df.columns]
-    db_df = df[available_columns].copy()
-
-    # 添加可选列（如果存在）
-    for col in optional_columns:
-        if col in df.columns:
-            db_df[col] = df[col]
-        else:
-            db_df[col] = None  # 为缺失的列填充默认值
-
-    # 将tags列表转换为字符串存储
-    if 'tags' in db_df.columns:
-        db_df['tags'] = db_df['tags'].apply(lambda x: str(x) if isinstance(x, list) else (x if pd.notna(x) else '[]'))
+    db_df = df.reindex(columns=available_columns + optional_columns)
 
     # 保存到数据库
     if save_to_db:
-        save_to_db(db_df, DB_PATH)
+        # 参数名 save_to_db 遮蔽了同名函数，这里显式导入
+        from ..db import save_to_db as save_to_db_func
+        save_to_db_func(db_df, DB_PATH)
+        update_last_model_count(_MODEL_TREE_STATS_PLATFORM, total_count)
         print(f"💾 已保存 {len(db_df)} 条记录到数据库")
 
     return df, total_count
 
 
+def _load_today_model_tree() -> pd.DataFrame:
+    """
+    读取数据库中今天已保存的 Hugging Face Model Tree 记录
+
+    Returns:
+        DataFrame: 今天的 Model Tree 记录（列与重新爬取时一致，即 _HF_RECORD_COLUMNS），没有时为空
+    """
+    from ..db import load_data_from_db
+    today_data = load_data_from_db(date_filter=date.today().isoformat(), platform_filter=['Hugging Face'])
+    if today_data.empty or 'data_source' not in today_data.columns:
+        return pd.DataFrame()
+    # 普通 Hugging Face 搜索也会写入 data_source='search'，以 Model Tree 独有的来源判断
+    if not today_data['data_source'].isin(_MODEL_TREE_ONLY_SOURCES).any():
+        return pd.DataFrame()
+    today_tree = today_data[today_data['data_source'].isin(_MODEL_TREE_SOURCES)].reset_index(drop=True)
+    # 只保留与重新爬取一致的列：丢弃 _rowid_ / rn 等内部列，缺失的列补为空
+    return today_tree.reindex(columns=_HF_RECORD_COLUMNS)
+
+
 def get_new_derivatives_since(last_date: str) -> pd.DataFrame:
     """
     获取自指定日期以来的新增衍生模型
@@ -836,7 +1115,7 @@ def get_new_derivatives_since(last_date: str) -> pd.DataFrame:
 
         # 筛选ERNIE相关的衍生模型
         ernie_data = recent_data[
-            recent_data['model_name'].str.contains('ernie|ERNIE|paddleocr|PaddleOCR', case=False, na=False)
+            recent_data['model_name'].str.contains(_ERNIE_NAME_RE, na=False)
         ].copy()
 
         return ernie_data
@@ -846,112 +1125,260 @@ def get_new_derivatives_since(last_date: str) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-def get_weekly_new_finetune_adapters(current_date: str, previous_date: str, model_series: str = 'ERNIE-4.5') -> Dict:
+def parse_tags(raw_tags) -> list:
+    """解析数据库中以字符串存储的 tags（缺失、为空或无法解析时返回空列表）"""
+    if isinstance(raw_tags, list):
+        return raw_tags
+    if not isinstance(raw_tags, str) or not raw_tags:
+        return []
+    return list(_parse_tags_str(raw_tags))
+
+
+@lru_cache(maxsize=4096)
+def _parse_tags_str(raw_tags: str) -> Tuple[str, ...]:
     """
-    获取本周新增的Finetune和Adapter模型（用于周报展示）
+    解析 tags 字符串（按字符串缓存：同一模型的多个版本/检查点往往共用相同的 tags）
+
+    返回不可变的 tuple，避免调用方修改缓存中的结果；无法解析时返回空 tuple
+    """
+    # 快速路径：tags 由 repr(list) 写入，不含双引号时把单引号换成双引号即为合法 JSON，
+    # json.loads 的 C 实现比 literal_eval 构建 AST 快得多；解析失败再走 literal_eval
+    if '"' not in raw_tags:
+        try:
+            parsed = json.loads(raw_tags.replace("'", '"'))
+            if isinstance(parsed, list):
+                return tuple(parsed)
+        except Exception:
+            pass
+    # 脏数据可能触发 ValueError / SyntaxError 以外的异常（TypeError、RecursionError、MemoryError 等），一律视为无法解析
+    try:
+        parsed = ast.literal_eval(raw_tags)
+    except Exception:
+        return ()
+    return tuple(parsed) if isinstance(parsed, list) else ()
+
+
+def _classify_model_types(df: pd.DataFrame) -> List[str]:
+    """
+    按 model_name / tags 批量计算 model_type（兼容旧数据缺失 model_type 的情况）
+
+    结果只取决于 (model_name, tags)：先对两列做 factorize 得到去重后的组合，
+    每种组合只解析、分类一次，再按编码映射回各行
+    """
+    names = df['model_name']
+    raw_tags = df['tags'] if 'tags' in df.columns else pd.Series([None] * len(df), index=df.index, dtype=object)
+
+    # tags 中有非字符串的值（如已解析的列表）时无法哈希，逐行计算
+    if not raw_tags.map(lambda tags: tags is None or isinstance(tags, str), na_action='ignore').all():
+        return [
+            classify_model_type(name, parse_tags(tags), None)
+            for name, tags in zip(names.tolist(), raw_tags.tolist())
+        ]
+
+    name_codes, unique_names = pd.factorize(names, use_na_sentinel=False)
+    tag_codes, unique_tags = pd.factorize(raw_tags, use_na_sentinel=False)
+    n_tags = len(unique_tags)
+    pair_codes, unique_pairs = pd.factorize(name_codes.astype(np.int64) * n_tags + tag_codes)
+
+    unique_names = list(unique_names)
+    unique_tags = list(unique_tags)
+    pair_types = [
+        classify_model_type(unique_names[pair // n_tags], parse_tags(unique_tags[pair % n_tags]), None)
+        for pair in unique_pairs.tolist()
+    ]
+    return [pair_types[code] for code in pair_codes.tolist()]
+
+
+# 周报对比只需要的列
+_WEEKLY_COLUMNS = ['model_name', 'publisher', 'download_count', 'base_model', 'model_type', 'tags']
+
+
+@lru_cache(maxsize=32)
+def _load_weekly_snapshot(date: str, category: str, require_base_model: bool, data_version: tuple) -> pd.DataFrame:
+    """
+    读取某一天 Hugging Face 平台指定系列的周报数据（按日期/系列/数据库版本缓存）
+
+    同一次周报中对比日期通常不变，多个系列、多张图表可以复用同一份快照；
+    调用方只能读取返回的 DataFrame，需要修改时先 copy()
 
     Args:
-        current_date: 当前日期 (YYYY-MM-DD)
+        date: 日期 (YYYY-MM-DD)
+        category: model_category
+        require_base_model: 是否只保留 base_model 不为空的记录（Model Tree 衍生模型）
+        data_version: 数据库版本标识，仅作为缓存键
+
+    Returns:
+        DataFrame: 筛选后的数据
+    """
+    from ..db import load_data_from_db
+
+    return load_data_from_db(
+        date_filter=date, platform_filter=['Hugging Face'], model_category=category,
+        require_base_model=require_base_model, columns=_WEEKLY_COLUMNS, categorical=True
+    )
+
+
+@lru_cache(maxsize=32)
+def _load_weekly_new_models(current_date: str, previous_date: str, category: str, require_base_model: bool,
+                            data_version: tuple) -> pd.DataFrame:
+    """
+    读取本期相对对比期新增的 Hugging Face 指定系列模型（差集在 SQL 中完成，按日期/系列/数据库版本缓存）
+
+    调用方只能读取返回的 DataFrame，需要修改时先 copy()
+
+    Args:
+        current_date: 本期日期 (YYYY-MM-DD)
         previous_date: 对比日期 (YYYY-MM-DD)
-        model_series: 模型系列 ('ERNIE-4.5' 或 'PaddleOCR-VL')
+        category: model_category
+        require_base_model: 是否只比较 base_model 不为空的记录（Model Tree 衍生模型）
+        data_version: 数据库版本标识，仅作为缓存键
 
     Returns:
-        Dict: 包含本周新增Finetune和Adapter模型信息的字典
+        DataFrame: 新增记录
     """
-    try:
-        from ..db import load_data_from_db
+    from ..db import load_new_models_between
 
-        # 获取两个日期的数据
-        current_data = load_data_from_db(date_filter=current_date)
-        previous_data = load_data_from_db(date_filter=previous_date)
+    return load_new_models_between(
+        current_date, previous_date, model_category=category, platform='Hugging Face',
+        require_base_model=require_base_model, columns=_WEEKLY_COLUMNS, categorical=True
+    )
 
-        if current_data.empty:
-            return {
-                'new_finetune_models': [],
-                'new_adapter_models': [],
-                'new_lora_models': [],
-                'total_new': 0,
-                'summary': '本周没有新增模型数据'
-            }
 
-        # 🔧 修复：使用 model_category 字段精确筛选，而不是搜索 model_name
-        # 根据 model_series 确定要筛选的 model_category
-        if model_series == 'ERNIE-4.5':
-            target_category = 'ernie-4.5'
-        elif model_series == 'PaddleOCR-VL':
-            target_category = 'paddleocr-vl'
-        else:
-            # 默认为 ERNIE-4.5
-            target_category = 'ernie-4.5'
+def _model_type_missing(df: pd.DataFrame) -> bool:
+    """
+    判断 model_type 是否缺失（列不存在或全部为空），需要重新分类（兼容旧数据）
 
-        # 筛选Hugging Face平台的指定系列模型（使用 model_category 字段）
-        hf_current = current_data[
-            (current_data['repo'] == 'Hugging Face') &
-            (current_data['model_category'] == target_category)
-        ].copy()
+    周报数据中 model_type 为 category 类型：类别为空时无需扫描即可判定，
+    否则只检查 int 编码（-1 表示缺失）；其他类型通常第一行就有值，直接短路，
+    避免对 object 列做整列 isna()
+    """
+    if 'model_type' not in df.columns:
+        return True
+    model_type = df['model_type']
+    if isinstance(model_type.dtype, pd.CategoricalDtype):
+        if len(model_type.cat.categories) == 0:
+            return True
+        return not (model_type.cat.codes.to_numpy() >= 0).any()
+    if len(model_type) and pd.notna(model_type.iat[0]):
+        return False
+    return model_type.first_valid_index() is None
 
-        if previous_data.empty:
-            # 如果没有对比数据，假设所有都是新增的
-            hf_previous = pd.DataFrame()
-        else:
-            hf_previous = previous_data[
-                (previous_data['repo'] == 'Hugging Face') &
-                (previous_data['model_category'] == target_category)
-            ].copy()
-
-        # 找出新增的模型（在当前数据中但不在对比数据中）
-        if hf_previous.empty:
-            new_models = hf_current.copy()
-        else:
-            previous_model_names = set(hf_previous['model_name'].tolist())
-            new_models = hf_current[~hf_current['model_name'].isin(previous_model_names)].copy()
 
-        if new_models.empty:
+def _weekly_new_models(current_date: str, previous_date: str, model_series: str,
+                       require_base_model: bool, split_by_type: bool, data_version: tuple) -> Dict:
+    """
+    本周新增模型统计的公共实现（出错时抛出异常，由调用方处理）
+
+    Args:
+        current_date: 当前日期 (YYYY-MM-DD)
+        previous_date: 对比日期 (YYYY-MM-DD)
+        model_series: 模型系列 ('ERNIE-4.5' 或 'PaddleOCR-VL')
+        require_base_model: 是否只统计 base_model 不为空的记录（Model Tree 衍生模型）
+        split_by_type: True 时按 Finetune/Adapter/LoRA 分组返回，False 时返回 Model Tree 衍生模型列表
+        data_version: 数据库版本标识
+
+    Returns:
+        Dict: 本周新增模型信息
+    """
+    if split_by_type:
+        def empty_result(summary):
             return {
                 'new_finetune_models': [],
                 'new_adapter_models': [],
                 'new_lora_models': [],
                 'total_new': 0,
-                'summary': '本周没有新增Finetune或Adapter模型'
+                'summary': summary
+            }
+        no_new_summary = '本周没有新增Finetune或Adapter模型'
+    else:
+        def empty_result(summary):
+            return {
+                'new_model_tree_models': [],
+                'total_new': 0,
+                'summary': summary
             }
+        no_new_summary = '本周没有新增 Model Tree 衍生模型'
+
+    from ..utils import to_records
+
+    # 🔧 修复：使用 model_category 字段精确筛选，而不是搜索 model_name
+    target_category = SERIES_TO_CATEGORY.get(model_series, 'ernie-4.5')
+
+    # 找出新增的模型（在当前数据中但不在对比数据中；没有对比数据时全部视为新增）：
+    # 只取 Hugging Face 平台指定系列的记录和需要的列（require_base_model 时再要求 base_model 不为空），差集在 SQL 中完成
+    new_models = _load_weekly_new_models(current_date, previous_date, target_category,
+                                         require_base_model, data_version)
+
+    if new_models.empty:
+        # 没有新增时才读取本期快照，区分“本期没有数据”和“没有新增”
+        if _load_weekly_snapshot(current_date, target_category, require_base_model, data_version).empty:
+            return empty_result('本周没有新增模型数据')
+        return empty_result(no_new_summary)
+
+    # 🔧 修复：直接使用数据库中已经存储的 model_type 字段，而不是重新分类
+    # 数据在入库时已经通过 classify_model_type() 正确分类了
+    # 如果 model_type 列不存在或为空，才进行分类（兼容旧数据）
+    if _model_type_missing(new_models):
+        logger.warning("model_type 字段不存在或全部为空，尝试重新分类")
+        new_models = new_models.copy()  # 唯一需要写入的地方，只在这里复制
+        new_models['model_type'] = _classify_model_types(new_models)
+
+    total_new = len(new_models)
+
+    if not split_by_type:
+        # 增加 base_model 和 model_type 列，方便在周报中显示详细信息
+        if 'base_model' in new_models.columns and 'model_type' in new_models.columns:
+            columns = ['model_name', 'publisher', 'download_count', 'base_model', 'model_type']
+        else:
+            columns = ['model_name', 'publisher', 'download_count']
+        return {
+            'new_model_tree_models': to_records(new_models, columns),
+            'total_new': total_new,
+            'summary': f'本周 Model Tree 新增 {total_new} 个衍生模型'
+        }
 
-        # 🔧 修复：直接使用数据库中已经存储的 model_type 字段，而不是重新分类
-        # 数据在入库时已经通过 classify_model_type() 正确分类了
-        # 如果 model_type 列不存在或为空，才进行分类（兼容旧数据）
-        if 'model_type' not in new_models.columns or new_models['model_type'].isna().all():
-            print("⚠️ 警告：model_type 字段不存在或全部为空，尝试重新分类")
-            new_models['model_type'] = new_models.apply(
-                lambda row: classify_model_type(
-                    row['model_name'],
-                    eval(row['tags']) if pd.notna(row.get('tags')) and row.get('tags') else [],
-                    None
-                ),
-                axis=1
-            )
+    # 按类型分类：一次 groupby 分桶（代替三次整列比较），各类型数量直接取分组大小
+    groups = dict(list(new_models.groupby('model_type', sort=False, observed=True)))
+    no_models = new_models.iloc[:0]
+    new_finetune = groups.get('finetune', no_models)
+    new_adapter = groups.get('adapter', no_models)
+    new_lora = groups.get('lora', no_models)
+    n_finetune, n_adapter, n_lora = len(new_finetune), len(new_adapter), len(new_lora)
 
-        # 按类型分类
-        new_finetune = new_models[new_models['model_type'] == 'finetune'].copy()
-        new_adapter = new_models[new_models['model_type'] == 'adapter'].copy()
-        new_lora = new_models[new_models['model_type'] == 'lora'].copy()
+    # 格式化输出
+    def format_models(df):
+        return to_records(df, ['model_name', 'publisher', 'download_count'])
 
-        # 格式化输出
-        def format_models(df):
-            if df.empty:
-                return []
-            return df[['model_name', 'publisher', 'download_count']].to_dict('records')
-
-        result = {
-            'new_finetune_models': format_models(new_finetune),
-            'new_adapter_models': format_models(new_adapter),
-            'new_lora_models': format_models(new_lora),
-            'total_new': len(new_models),
-            'summary': f'本周共发现 {len(new_models)} 个新增模型，其中 Finetune {len(new_finetune)} 个，Adapter {len(new_adapter)} 个，LoRA {len(new_lora)} 个'
-        }
+    return {
+        'new_finetune_models': format_models(new_finetune),
+        'new_adapter_models': format_models(new_adapter),
+        'new_lora_models': format_models(new_lora),
+        'total_new': total_new,
+        'summary': f'本周共发现 {total_new} 个新增模型，其中 Finetune {n_finetune} 个，Adapter {n_adapter} 个，LoRA {n_lora} 个'
+    }
+
+
+def get_weekly_new_finetune_adapters(current_date: str, previous_date: str, model_series: str = 'ERNIE-4.5') -> Dict:
+    """
+    获取本周新增的Finetune和Adapter模型（用于周报展示）
 
-        return result
+    Args:
+        current_date: 当前日期 (YYYY-MM-DD)
+        previous_date: 对比日期 (YYYY-MM-DD)
+        model_series: 模型系列 ('ERNIE-4.5' 或 'PaddleOCR-VL')
+
+    Returns:
+        Dict: 包含本周新增Finetune和Adapter模型信息的字典
+    """
+    try:
+        from ..db import get_data_version
+
+        return _weekly_new_models(current_date, previous_date, model_series,
+                                  require_base_model=False, split_by_type=True,
+                                  data_version=get_data_version())
 
     except Exception as e:
-        print(f"获取本周新增Finetune/Adapter模型失败: {e}")
+        logger.exception("获取本周新增Finetune/Adapter模型失败")
         return {
             'new_finetune_models': [],
             'new_adapter_models': [],
@@ -966,6 +1393,7 @@ def get_weekly_new_model_tree_derivatives(current_date: str, previous_date: str,
     获取本周新增的 Model Tree 衍生模型（专门统计）
 
     注意：只统计通过 Model Tree 找到的衍生模型（base_model 字段不为空）
+    结果按 (日期, 系列, 数据库版本) 缓存，数据库写入后自动失效
 
     Args:
         current_date: 当前日期 (YYYY-MM-DD)
@@ -976,100 +1404,16 @@ def get_weekly_new_model_tree_derivatives(current_date: str, previous_date: str,
         Dict: 包含本周新增Model Tree衍生模型信息的字典
     """
     try:
-        from ..db import load_data_from_db
-
-        # 获取两个日期的数据
-        current_data = load_data_from_db(date_filter=current_date)
-        previous_data = load_data_from_db(date_filter=previous_date)
+        from ..db import get_data_version
 
-        if current_data.empty:
-            return {
-                'new_model_tree_models': [],
-                'total_new': 0,
-                'summary': '本周没有新增模型数据'
-            }
-
-        # 🔧 修复：使用 model_category 字段精确筛选，而不是搜索 model_name
-        # 根据 model_series 确定要筛选的 model_category
-        if model_series == 'ERNIE-4.5':
-            target_category = 'ernie-4.5'
-        elif model_series == 'PaddleOCR-VL':
-            target_category = 'paddleocr-vl'
-        else:
-            # 默认为 ERNIE-4.5
-            target_category = 'ernie-4.5'
-
-        # 只筛选 Hugging Face 平台的指定系列模型，且 base_model 不为空（Model Tree 衍生模型）
-        hf_current = current_data[
-            (current_data['repo'] == 'Hugging Face') &
-            (current_data['model_category'] == target_category) &
-            (current_data['base_model'].notna()) &  # 只要 Model Tree 找到的
-            (current_data['base_model'] != '') &    # base_model 不为空
-            (current_data['base_model'] != 'None')  # 排除字符串 'None'
-        ].copy()
-
-        if previous_data.empty:
-            # 如果没有对比数据，假设所有都是新增的
-            hf_previous = pd.DataFrame()
-        else:
-            hf_previous = previous_data[
-                (previous_data['repo'] == 'Hugging Face') &
-                (previous_data['model_category'] == target_category) &
-                (previous_data['base_model'].notna()) &
-                (previous_data['base_model'] != '') &
-                (previous_data['base_model'] != 'None')
-            ].copy()
-
-        # 找出新增的模型（在当前数据中但不在对比数据中）
-        if hf_previous.empty:
-            new_models = hf_current.copy()
-        else:
-            previous_model_names = set(hf_previous['model_name'].tolist())
-            new_models = hf_current[~hf_current['model_name'].isin(previous_model_names)].copy()
-
-        if new_models.empty:
-            return {
-                'new_model_tree_models': [],
-                'total_new': 0,
-                'summary': '本周没有新增 Model Tree 衍生模型'
-            }
-
-        # 🔧 修复：直接使用数据库中已经存储的 model_type 字段，而不是重新分类
-        # 数据在入库时已经通过 classify_model_type() 正确分类了
-        # 如果 model_type 列不存在或为空，才进行分类（兼容旧数据）
-        if 'model_type' not in new_models.columns or new_models['model_type'].isna().all():
-            print("⚠️ 警告：model_type 字段不存在或全部为空，尝试重新分类")
-            new_models['model_type'] = new_models.apply(
-                lambda row: classify_model_type(
-                    row['model_name'],
-                    eval(row['tags']) if pd.notna(row.get('tags')) and row.get('tags') else [],
-                    None
-                ),
-                axis=1
-            )
-
-        # 格式化输出（增加 base_model 和 model_type 信息）
-        def format_models(df):
-            if df.empty:
-                return []
-            # 增加 base_model 和 model_type 列，方便在周报中显示详细信息
-            if 'base_model' in df.columns and 'model_type' in df.columns:
-                return df[['model_name', 'publisher', 'download_count', 'base_model', 'model_type']].to_dict('records')
-            else:
-                return df[['model_name', 'publisher', 'download_count']].to_dict('records')
-
-        result = {
-            'new_model_tree_models': format_models(new_models),
-            'total_new': len(new_models),
-            'summary': f'本周 Model Tree 新增 {len(new_models)} 个衍生模型'
-        }
-
-        return result
+        result = _compute_weekly_model_tree_derivatives(
+            current_date, previous_date, model_series, get_data_version()
+        )
+        # 返回副本，避免调用方修改缓存中的结果
+        return copy.deepcopy(result)
 
     except Exception as e:
-        print(f"获取本周新增 Model Tree 衍生模型失败: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("获取本周新增 Model Tree 衍生模型失败")
         return {
             'new_model_tree_models': [],
             'total_new': 0,
@@ -1077,6 +1421,26 @@ def get_weekly_new_model_tree_derivatives(current_date: str, previous_date: str,
         }
 
 
+@lru_cache(maxsize=64)
+def _compute_weekly_model_tree_derivatives(current_date: str, previous_date: str, model_series: str,
+                                           data_version: tuple) -> Dict:
+    """
+    get_weekly_new_model_tree_derivatives 的缓存层（出错时抛出异常，不会被缓存）
+
+    Args:
+        current_date: 当前日期 (YYYY-MM-DD)
+        previous_date: 对比日期 (YYYY-MM-DD)
+        model_series: 模型系列
+        data_version: 数据库版本标识，同时作为缓存键
+
+    Returns:
+        Dict: 本周新增Model Tree衍生模型信息
+    """
+    return _weekly_new_models(current_date, previous_date, model_series,
+                              require_base_model=True, split_by_type=False,
+                              data_version=data_version)
+
+
 # =============================================================================
 # ModelScope Model Tree 功能模块
 # =============================================================================
@@ -1170,7 +1534,7 @@ def get_modelscope_model_tree_children(base_model_id: str, driver=None, progress
                         name_en = text_parts[1].strip()
 
                         # 提取模型数量（通常在最后一个部分）
-                        count_match = re.search(r'共(\d+)个模型', element_text)
+                        count_match = _MODELSCOPE_TREE_COUNT_RE.search(element_text)
                         count = int(count_match.group(1)) if count_match else 0
 
                         if count > 0:
@@ -1767,7 +2131,7 @@ def get_all_modelscope_derivatives(
 
     # 转换为 DataFrame
     if all_models:
-        df = pd.DataFrame(all_models)
+        df = pd.DataFrame.from_records(all_models, columns=_MODELSCOPE_RECORD_COLUMNS)
         print(f"\n{'=' * 80}")
         print(f"✅ 成功获取 {len(df)} 个衍生模型")
         print(f"{'=' * 80}")
@@ -1816,27 +2180,21 @@ def update_modelscope_model_tree(
             import sqlite3
             from ..db import load_data_from_db, save_to_db as save_to_db_func
 
-            # 获取现有 ModelScope 数据
+            # 获取现有 ModelScope 数据（在 SQL 中直接拼接 publisher/model_name）
             conn = sqlite3.connect(DB_PATH)
             existing_query = """
-                SELECT DISTINCT publisher, model_name
+                SELECT DISTINCT publisher || '/' || model_name AS model_key
                 FROM model_downloads
                 WHERE repo = 'ModelScope'
+                  AND publisher IS NOT NULL AND model_name IS NOT NULL
             """
             existing_df = pd.read_sql_query(existing_query, conn)
             conn.close()
 
             if not existing_df.empty:
-                # 创建已存在模型的集合
-                existing_models = set(
-                    f"{row['publisher']}/{row['model_name']}"
-                    for _, row in existing_df.iterrows()
-                )
-
-                # 过滤掉已存在的模型
-                df['model_key'] = df['publisher'] + '/' + df['model_name']
-                new_df = df[~df['model_key'].isin(existing_models)].copy()
-                new_df = new_df.drop(columns=['model_key'])
+                # 过滤掉已存在的模型（只计算布尔掩码，不向 df 写入临时列、不整表复制）
+                model_keys = df['publisher'] + '/' + df['model_name']
+                new_df = df[~model_keys.isin(existing_df['model_key'])]
 
                 print(f"📊 去重前: {len(df)} 条，去重后: {len(new_df)} 条")
                 print(f"🗑️  过滤掉 {len(df) - len(new_df)} 条已存在的记录")
@@ -1859,65 +2217,6 @@ def update_modelscope_model_tree(
     return df, total_count
 
 
-if __name__ == "__main__":
-    # 测试功能
-    print("=== 测试 Model Tree 功能 ===")
-    print("1. Hugging Face Model Tree")
-    print("2. AI Studio Model Tree")
-    print("3. ModelScope Model Tree (NEW)")
-    print("4. 全部测试")
-    print()
-
-    choice = input("请选择测试模式 (1/2/3/4=全部, 默认=4): ").strip()
-
-    # 测试分类功能
-    test_cases = [
-        ("ernie-4.5-8b", "baidu"),
-        ("ernie-4.5-8b-finetuned", "user123"),
-        ("paddleocr-vl", "PaddlePaddle"),
-        ("ernie-3.0", "baidu"),
-        ("some-other-model", "user")
-    ]
-
-    print("\n🧪 测试模型分类:")
-    for model_name, publisher in test_cases:
-        category = classify_model(model_name, publisher)
-        print(f"  {model_name} -> {category}")
-
-    # 测试Hugging Face Model Tree
-    if choice in ['1', '4', '']:
-        print("\n🌳 测试 Hugging Face Model Tree:")
-        df, count = get_all_ernie_derivatives(include_paddleocr=True)
-        print(f"总共获取到 {count} 个模型")
-
-        if not df.empty:
-            print("\n前5个模型:")
-            print(df[['model_name', 'publisher', 'download_count', 'model_category']].head())
-
-    # 测试AI Studio Model Tree
-    if choice in ['2', '4', '']:
-        print("\n🌳 测试 AI Studio Model Tree (测试模式):")
-        df, count = update_aistudio_model_tree(save_to_db=False, test_mode=True)
-        print(f"总共获取到 {count} 个衍生模型")
-
-        if not df.empty:
-            print("\n前5个衍生模型:")
-            print(df[['model_name', 'publisher', 'download_count', 'model_type', 'base_model']].head())
-
-    # 测试 ModelScope Model Tree
-    if choice in ['3', '4', '']:
-        print("\n🌳 测试 ModelScope Model Tree:")
-        df, count = update_modelscope_model_tree(
-            save_to_db=False,
-            base_models=['PaddlePaddle/PaddleOCR-VL']
-        )
-        print(f"总共获取到 {count} 个衍生模型")
-
-        if not df.empty:
-            print("\n前5个衍生模型:")
-            print(df[['model_name', 'publisher', 'download_count', 'model_type', 'base_model']].head())
-
-
 # =============================================================================
 # AI Studio Model Tree 功能模块
 # =============================================================================
@@ -2155,7 +2454,7 @@ def fetch_aistudio_model_tree(
                             By.CSS_SELECTOR, "div.opt-link"
                         ).text.strip()
 
-                        count_match = re.search(r'(\d+)', count_text)
+                        count_match = _AISTUDIO_TREE_COUNT_RE.search(count_text)
                         count = int(count_match.group(1)) if count_match else 0
 
                         # 获取链接
@@ -2344,7 +2643,7 @@ def fetch_aistudio_model_tree(
 
         # 转换为DataFrame
         if all_derivative_models:
-            df = pd.DataFrame(all_derivative_models)
+            df = pd.DataFrame.from_records(all_derivative_models, columns=_AISTUDIO_RECORD_COLUMNS)
             log(f"\n{'=' * 80}")
             log(f"✅ 成功获取 {len(df)} 个衍生模型")
             if skipped_url_count > 0:
@@ -2406,27 +2705,21 @@ def update_aistudio_model_tree(save_to_db=True, test_mode=False):
             from ..db import load_data_from_db, save_to_db as save_to_db_func
             import sqlite3
 
-            # 获取现有AI Studio数据
+            # 获取现有AI Studio数据（在 SQL 中直接拼接 publisher/model_name）
             conn = sqlite3.connect(DB_PATH)
             existing_query = """
-                SELECT DISTINCT publisher, model_name
+                SELECT DISTINCT publisher || '/' || model_name AS model_key
                 FROM model_downloads
                 WHERE repo = 'AI Studio'
+                  AND publisher IS NOT NULL AND model_name IS NOT NULL
             """
             existing_df = pd.read_sql_query(existing_query, conn)
             conn.close()
 
             if not existing_df.empty:
-                # 创建已存在模型的集合
-                existing_models = set(
-                    f"{row['publisher']}/{row['model_name']}"
-                    for _, row in existing_df.iterrows()
-                )
-
-                # 过滤掉已存在的模型
-                df['model_key'] = df['publisher'] + '/' + df['model_name']
-                new_df = df[~df['model_key'].isin(existing_models)].copy()
-                new_df = new_df.drop(columns=['model_key'])
+                # 过滤掉已存在的模型（只计算布尔掩码，不向 df 写入临时列、不整表复制）
+                model_keys = df['publisher'] + '/' + df['model_name']
+                new_df = df[~model_keys.isin(existing_df['model_key'])]
 
                 print(f"📊 去重前: {len(df)} 条，去重后: {len(new_df)} 条")
                 print(f"🗑️  过滤掉 {len(df) - len(new_df)} 条已存在的记录")
@@ -2447,3 +2740,67 @@ def update_aistudio_model_tree(save_to_db=True, test_mode=False):
             traceback.print_exc()
 
     return df, total_count
+
+
+if __name__ == "__main__":
+    # 测试功能
+    print("=== 测试 Model Tree 功能 ===")
+
+    # 完整的 Model Tree 抓取需要访问网络、耗时较长，只在设置 ERNIE_SMOKE_FULL=1 时运行；
+    # 默认只跑本地的分类测试
+    choice = None
+    if os.environ.get('ERNIE_SMOKE_FULL') == '1':
+        print("1. Hugging Face Model Tree")
+        print("2. AI Studio Model Tree")
+        print("3. ModelScope Model Tree (NEW)")
+        print("4. 全部测试")
+        print()
+
+        choice = input("请选择测试模式 (1/2/3/4=全部, 默认=4): ").strip()
+
+    # 测试分类功能
+    test_cases = [
+        ("ernie-4.5-8b", "baidu"),
+        ("ernie-4.5-8b-finetuned", "user123"),
+        ("paddleocr-vl", "PaddlePaddle"),
+        ("ernie-3.0", "baidu"),
+        ("some-other-model", "user")
+    ]
+
+    print("\n🧪 测试模型分类:")
+    for model_name, publisher in test_cases:
+        category = classify_model(model_name, publisher)
+        print(f"  {model_name} -> {category}")
+
+    # 测试Hugging Face Model Tree
+    if choice in ['1', '4', '']:
+        print("\n🌳 测试 Hugging Face Model Tree:")
+        df, count = get_all_ernie_derivatives(include_paddleocr=True)
+        print(f"总共获取到 {count} 个模型")
+
+        if not df.empty:
+            print("\n前5个模型:")
+            print(df[['model_name', 'publisher', 'download_count', 'model_category']].head())
+
+    # 测试AI Studio Model Tree
+    if choice in ['2', '4', '']:
+        print("\n🌳 测试 AI Studio Model Tree (测试模式):")
+        df, count = update_aistudio_model_tree(save_to_db=False, test_mode=True)
+        print(f"总共获取到 {count} 个衍生模型")
+
+        if not df.empty:
+            print("\n前5个衍生模型:")
+            print(df[['model_name', 'publisher', 'download_count', 'model_type', 'base_model']].head())
+
+    # 测试 ModelScope Model Tree
+    if choice in ['3', '4', '']:
+        print("\n🌳 测试 ModelScope Model Tree:")
+        df, count = update_modelscope_model_tree(
+            save_to_db=False,
+            base_models=['PaddlePaddle/PaddleOCR-VL']
+        )
+        print(f"总共获取到 {count} 个衍生模型")
+
+        if not df.empty:
+            print("\n前5个衍生模型:")
+            print(df[['model_name', 'publisher', 'download_count', 'model_type', 'base_model']].head())
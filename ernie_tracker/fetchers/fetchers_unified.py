@@ -66,7 +66,8 @@ def fetch_hugging_face_data_unified(progress_callback=None, progress_total=None,
 
                     # 选择存在的列
                     cols_to_keep = [col for col in required_cols + optional_cols if col in hf_tree_df.columns]
-                    tree_results = hf_tree_df[cols_to_keep].to_dict('records')
+                    # 按列 tolist() 后 zip 成记录，不再先切片出子表再 to_dict('records')
+                    tree_results = to_records(hf_tree_df, cols_to_keep)
 
                     all_models.extend(tree_results)
                     print(f"✅ Model Tree获取: {len(tree_results)} 个ERNIE/PaddleOCR相关模型")
@@ -323,7 +324,7 @@ def fetch_modelscope_data_unified(progress_callback=None, progress_total=None):
 
 
 # AI Studio (使用修复后的selenium版本)
-from ..utils import create_chrome_driver, is_simplified_count, extract_numbers
+from ..utils import create_chrome_driver, is_simplified_count, extract_numbers, to_records
 
 def fetch_aistudio_data_unified(progress_callback=None, progress_total=None):
     """统一获取AI Studio上的PaddlePaddle模型"""
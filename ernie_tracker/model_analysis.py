@@ -259,6 +259,22 @@ def get_model_group(base_model: str) -> Optional[str]:
     return None
 
 
+def has_base_model(base_model: pd.Series) -> pd.Series:
+    """
+    base_model 有效（非空、非 ''、非 'None'）的布尔掩码
+
+    缺失值先统一填成 ''，再用一次 isin 完成判断，
+    代替 notna() & != '' & != 'None' 三次整列扫描和两次掩码合并
+
+    Args:
+        base_model: base_model 列
+
+    Returns:
+        布尔 Series
+    """
+    return ~base_model.fillna('').isin(('', 'None'))
+
+
 def analyze_derivative_ecosystem(df: pd.DataFrame, infer_missing: bool = True) -> Dict:
     """
     分析衍生模型生态
@@ -306,11 +322,7 @@ def analyze_derivative_ecosystem(df: pd.DataFrame, infer_missing: bool = True) -
     print("\n📊 按分组统计衍生生态...")
 
     # 过滤出有 base_model 的记录（衍生模型）
-    derivatives = analysis_df[
-        analysis_df['base_model'].notna() &
-        (analysis_df['base_model'] != '') &
-        (analysis_df['base_model'] != 'None')
-    ].copy()
+    derivatives = analysis_df[has_base_model(analysis_df['base_model'])].copy()
 
     print(f"  ✅ 共有 {len(derivatives)} 个衍生模型")
 
@@ -468,11 +480,7 @@ def export_analysis_to_excel(analysis_result: Dict, df: pd.DataFrame, output_pat
             pd.DataFrame(group_stats).to_excel(writer, sheet_name='分组统计', index=False)
 
         # Sheet 3-N: 每个分组的详细模型列表
-        derivatives = df[
-            df['base_model'].notna() &
-            (df['base_model'] != '') &
-            (df['base_model'] != 'None')
-        ].copy()
+        derivatives = df[has_base_model(df['base_model'])].copy()
 
         derivatives['model_group'] = derivatives['base_model'].apply(get_model_group)
 
@@ -3,6 +3,7 @@
 """
 import time
 import re
+from contextlib import contextmanager
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -108,6 +109,35 @@ def create_chrome_driver(headless=SELENIUM_HEADLESS):
             )
 
 
+# 抓取下载量不需要的子资源（图片、字体、视频、统计脚本），通过 CDP 直接拦截以加快页面加载
+BLOCKED_RESOURCE_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4",
+    "*google-analytics*", "*googletagmanager*", "*hm.baidu.com*",
+]
+
+
+def block_page_resources(driver, patterns=BLOCKED_RESOURCE_PATTERNS):
+    """
+    通过 Chrome DevTools Protocol 拦截指定 URL 模式的请求
+
+    Args:
+        driver: WebDriver 实例
+        patterns: 要拦截的 URL 通配模式列表，传入空列表即取消拦截
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    except Exception as e:
+        print(f"设置资源拦截失败（不影响抓取）: {e}")
+
+
+# 带单位后缀的计数（如 7.3k、1.2M、7.3w、1k+），后缀对应的倍数
+_SUFFIXED_COUNT_RE = re.compile(r'^(\d+(?:\.\d+)?)([kmw])\+?$')
+_COUNT_SUFFIX_MULTIPLIERS = {'k': 1000, 'm': 1000000, 'w': 10000}
+_DIGITS_RE = re.compile(r'\d+')
+
+
 def extract_numbers(text):
     """
     从文本中提取数字，支持 K/M 后缀
@@ -131,27 +161,15 @@ def extract_numbers(text):
     if text.replace(',', '').isdigit():
         return int(text.replace(',', ''))
 
-    # 匹配 K 后缀（如 7.3k, 1.2k, 1k, 1k+）
-    k_match = re.match(r'^(\d+(?:\.\d+)?)k\+?$', text)
-    if k_match:
-        num = float(k_match.group(1))
-        return int(num * 1000)
+    # 匹配 K / M / W（中文万）后缀（如 7.3k, 1.2M, 7.3w, 1k+），一次匹配
+    suffix_match = _SUFFIXED_COUNT_RE.match(text)
+    if suffix_match:
+        num = float(suffix_match.group(1))
+        return int(num * _COUNT_SUFFIX_MULTIPLIERS[suffix_match.group(2)])
 
-    # 匹配 M 后缀（如 1.2M, 1M, 1M+）
-    m_match = re.match(r'^(\d+(?:\.\d+)?)m\+?$', text)
-    if m_match:
-        num = float(m_match.group(1))
-        return int(num * 1000000)
-
-    # 匹配 W 后缀（中文万，如 7.3w, 1.2w）
-    w_match = re.match(r'^(\d+(?:\.\d+)?)w\+?$', text)
-    if w_match:
-        num = float(w_match.group(1))
-        return int(num * 10000)
-
-    # 兜底：提取所有数字，取第一个
-    numbers = re.findall(r'\d+', text.replace(',', ''))
-    return int(numbers[0]) if numbers else None
+    # 兜底：提取第一个数字
+    first_number = _DIGITS_RE.search(text.replace(',', ''))
+    return int(first_number.group()) if first_number else None
 
 
 def safe_extract_text(element, selector, by_type="css", default=""):
@@ -217,3 +235,74 @@ def is_simplified_count(count_text):
     """
     count_text = count_text.strip()
     return not count_text.replace(' ', '').isdigit()
+
+
+class DownloadTextStable:
+    """
+    WebDriverWait 条件：等待下载量文本可解析为数字（含 7.3k / 1.2M / 7.3w / 1k+ 等简写）且连续两次轮询结果一致
+
+    用法:
+        WebDriverWait(driver, 10, poll_frequency=0.1).until(DownloadTextStable(xpath))
+
+    Args:
+        xpath: 下载量元素的 XPath
+        script: 可选的 JS 片段，通过 execute_script 一次往返直接返回下载量文本
+                （xpath 作为 arguments[0] 传入，供脚本兜底使用）
+
+    Returns:
+        稳定后的下载量原始字符串（已去除逗号，简写由 extract_numbers 解析），未稳定时返回 False 继续轮询
+    """
+
+    def __init__(self, xpath, script=None):
+        self.xpath = xpath
+        self.script = script
+        self.prev = None
+
+    def __call__(self, driver):
+        from selenium.webdriver.common.by import By
+
+        if self.script:
+            val = driver.execute_script(self.script, self.xpath) or ""
+        else:
+            # 每次轮询重新定位元素，避免 StaleElementReferenceException
+            val = driver.find_element(By.XPATH, self.xpath).text
+        val = val.strip().replace(',', '')
+        if val and val == self.prev and extract_numbers(val) is not None:
+            return val
+        self.prev = val
+        return False
+
+
+@contextmanager
+def no_implicit(driver):
+    """
+    临时关闭隐式等待，避免与 WebDriverWait 的显式轮询叠加
+
+    create_chrome_driver 默认设置了 10 秒隐式等待，显式等待中每次 find_element
+    失败都会先阻塞满隐式超时，导致轮询间隔和失败检测被严重拉长。
+
+    用法:
+        with no_implicit(driver):
+            wait.until(...)
+    """
+    old = driver.timeouts.implicit_wait
+    driver.implicitly_wait(0)
+    try:
+        yield driver
+    finally:
+        driver.implicitly_wait(old)
+
+
+def to_records(df, columns):
+    """
+    按列取值后逐行 zip 成字典列表（等价于 df[columns].to_dict('records')）
+
+    Args:
+        df: DataFrame
+        columns: 要输出的列名列表
+
+    Returns:
+        list[dict]: 每行一个字典；tolist() 返回 Python 原生类型，结果可直接序列化
+    """
+    values = [df[col].tolist() for col in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
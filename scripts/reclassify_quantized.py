@@ -4,7 +4,7 @@
 """
 import sqlite3
 import pandas as pd
-from ernie_tracker.fetchers.fetchers_modeltree import classify_model_type
+from ernie_tracker.fetchers.fetchers_modeltree import classify_model_type, parse_tags
 from ernie_tracker.config import DB_PATH
 
 
@@ -38,33 +38,27 @@ def reclassify_quantized_models(dry_run=True):
         reclassified_count = 0
         reclassified_records = []
 
-        for idx, row in df.iterrows():
-            model_name = row['model_name']
-            publisher = row['publisher']
+        # 按列取值（tolist 得到 Python 原生类型，rowid 可直接作为 SQL 参数）逐行 zip，避免 iterrows 为每一行构造 Series
+        columns = ['rowid', 'model_name', 'publisher', 'model_type', 'tags', 'date', 'repo']
+        for rowid, model_name, publisher, model_type, raw_tags, row_date, repo in zip(
+            *(df[col].tolist() for col in columns)
+        ):
             full_model_id = f"{publisher}/{model_name}"
 
-            # 解析 tags（如果有的话）
-            tags = []
-            if pd.notna(row['tags']) and row['tags']:
-                try:
-                    tags = eval(row['tags']) if isinstance(row['tags'], str) else row['tags']
-                except:
-                    tags = []
-
-            # 重新分类
-            new_type = classify_model_type(full_model_id, tags, None)
+            # 重新分类（parse_tags 按字符串缓存解析结果，无法解析的 tags 视为空列表）
+            new_type = classify_model_type(full_model_id, parse_tags(raw_tags), None)
 
             # 如果新分类为 quantized，记录下来
-            if new_type == 'quantized' and row['model_type'] != 'quantized':
+            if new_type == 'quantized' and model_type != 'quantized':
                 reclassified_count += 1
                 reclassified_records.append({
-                    'rowid': row['rowid'],
+                    'rowid': rowid,
                     'model_name': model_name,
                     'publisher': publisher,
-                    'old_type': row['model_type'],
+                    'old_type': model_type,
                     'new_type': new_type,
-                    'date': row['date'],
-                    'repo': row['repo']
+                    'date': row_date,
+                    'repo': repo
                 })
 
         if reclassified_count == 0:
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+测试 DriverPool（用假 driver 代替 Chrome，不启动浏览器）
+
+验证：
+1. release 后的 driver 会被下一次 acquire 复用，池满时多余的 driver 被关闭
+2. 已失效的空闲 driver 在 acquire 时被丢弃并新建
+3. 空闲超时后 driver 被后台定时器关闭
+4. shutdown 关闭池中所有 driver
+"""
+
+import sys
+import os
+import time
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ernie_tracker.fetchers import driver_pool
+
+
+class FakeDriver:
+    """只实现 DriverPool 用到的方法"""
+
+    def __init__(self):
+        self.alive = True
+        self.quit_count = 0
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise RuntimeError("browser closed")
+        return "about:blank"
+
+    def delete_all_cookies(self):
+        if not self.alive:
+            raise RuntimeError("browser closed")
+
+    def quit(self):
+        self.quit_count += 1
+
+
+def _make_pool(max_size=2, idle_timeout=60):
+    """创建使用 FakeDriver 的池，返回 (池, 已创建的 driver 列表)"""
+    created = []
+
+    def create_fake_driver():
+        created.append(FakeDriver())
+        return created[-1]
+
+    driver_pool.create_chrome_driver = create_fake_driver
+    return driver_pool.DriverPool(max_size=max_size, idle_timeout=idle_timeout), created
+
+
+def test_reuse_and_overflow():
+    """归还后复用；超过 max_size 的 driver 直接关闭"""
+    pool, created = _make_pool(max_size=2)
+    a, b, c = pool.acquire(), pool.acquire(), pool.acquire()
+    assert len(created) == 3
+
+    for driver in (a, b, c):
+        pool.release(driver)
+    assert c.quit_count == 1
+    assert a.quit_count == 0 and b.quit_count == 0
+
+    assert pool.acquire() is a
+    assert pool.acquire() is b
+    assert len(created) == 3
+    pool.shutdown()
+
+
+def test_stale_driver_replaced():
+    """空闲 driver 失效后 acquire 丢弃它并新建"""
+    pool, created = _make_pool()
+    a = pool.acquire()
+    pool.release(a)
+    a.alive = False
+
+    b = pool.acquire()
+    assert b is not a
+    assert a.quit_count == 1
+    assert len(created) == 2
+    pool.shutdown()
+
+
+def test_release_broken_driver():
+    """归还时清理 cookies 失败的 driver 被关闭，不放回池中"""
+    pool, created = _make_pool()
+    a = pool.acquire()
+    a.alive = False
+    pool.release(a)
+    assert a.quit_count == 1
+    assert pool.acquire() is not a
+    pool.shutdown()
+
+
+def test_idle_timeout():
+    """空闲超时后 driver 被关闭，下次 acquire 新建"""
+    pool, created = _make_pool(idle_timeout=0.2)
+    a = pool.acquire()
+    pool.release(a)
+    time.sleep(0.6)
+
+    assert a.quit_count == 1
+    assert pool.acquire() is not a
+    pool.shutdown()
+
+
+def test_shutdown():
+    """shutdown 关闭所有空闲 driver"""
+    pool, created = _make_pool(max_size=2)
+    a, b = pool.acquire(), pool.acquire()
+    pool.release(a)
+    pool.release(b)
+    pool.shutdown()
+    assert a.quit_count == 1 and b.quit_count == 1
+
+
+if __name__ == "__main__":
+    tests = [
+        test_reuse_and_overflow,
+        test_stale_driver_replaced,
+        test_release_broken_driver,
+        test_idle_timeout,
+        test_shutdown,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} 个测试失败")
+        sys.exit(1)
+    print("\n🎉 所有测试通过！")
+    sys.exit(0)
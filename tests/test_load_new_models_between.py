@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+测试 db.load_new_models_between（SQL 左反连接求本周新增模型）
+
+验证：
+1. 对比日期没有任何记录时，本期记录全部视为新增
+2. 模型名为 NULL / 空字符串的记录只与对比期中同样的模型名匹配
+3. 同日重复记录先去重，只返回优先级最高的一条
+4. require_base_model=True 时与原先的 pandas 实现结果一致
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+from contextlib import contextmanager
+
+import pandas as pd
+
+from ernie_tracker import db
+
+CURRENT = '2025-01-17'
+PREVIOUS = '2025-01-10'
+
+
+@contextmanager
+def temp_db(records):
+    """在临时 SQLite 数据库中写入记录，期间 db.DB_PATH 指向该数据库"""
+    original_path = db.DB_PATH
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'test.db')
+        db.DB_PATH = db_path
+        try:
+            db.init_database()
+            records = [{'repo': 'Hugging Face', 'model_category': 'ernie-4.5', **record} for record in records]
+            db.save_to_db(pd.DataFrame(records), db_path)
+            yield
+        finally:
+            db.DB_PATH = original_path
+
+
+def _pandas_new_models(current_date, previous_date, model_category, require_base_model):
+    """被替换前的 pandas 实现：分别读取两天数据，筛选后按 model_name 求差集"""
+    def select(date_filter):
+        data = db.load_data_from_db(date_filter=date_filter)
+        if data.empty:
+            return data
+        mask = (data['repo'] == 'Hugging Face') & (data['model_category'] == model_category)
+        if require_base_model:
+            mask &= (
+                data['base_model'].notna() &
+                (data['base_model'] != '') &
+                (data['base_model'] != 'None')
+            )
+        return data[mask]
+
+    hf_current = select(current_date)
+    hf_previous = select(previous_date)
+    if hf_previous.empty:
+        return hf_current
+    previous_model_names = set(hf_previous['model_name'].tolist())
+    return hf_current[~hf_current['model_name'].isin(previous_model_names)]
+
+
+def _keys(df):
+    """(publisher, model_name, download_count) 集合，NULL 统一为 None 便于比较"""
+    return sorted(
+        tuple(None if pd.isna(v) else v for v in row)
+        for row in df[['publisher', 'model_name', 'download_count']].itertuples(index=False)
+    )
+
+
+def test_previous_date_without_rows():
+    """对比日期没有记录：本期全部为新增"""
+    with temp_db([
+        {'date': CURRENT, 'publisher': 'a', 'model_name': 'a/m1', 'download_count': '10'},
+        {'date': CURRENT, 'publisher': 'b', 'model_name': 'b/m2', 'download_count': '20'},
+    ]):
+        new_models = db.load_new_models_between(CURRENT, PREVIOUS, model_category='ernie-4.5')
+
+        assert _keys(new_models) == [('a', 'a/m1', '10'), ('b', 'b/m2', '20')]
+        assert '_rowid_' not in new_models.columns
+        assert 'rn' not in new_models.columns
+
+
+def test_null_and_empty_model_names():
+    """NULL 模型名只与 NULL 匹配，空字符串只与空字符串匹配"""
+    with temp_db([
+        {'date': CURRENT, 'publisher': 'a', 'model_name': None, 'download_count': '1'},
+        {'date': CURRENT, 'publisher': 'b', 'model_name': '', 'download_count': '2'},
+        {'date': CURRENT, 'publisher': 'c', 'model_name': 'c/m', 'download_count': '3'},
+        {'date': PREVIOUS, 'publisher': 'a', 'model_name': None, 'download_count': '1'},
+        {'date': PREVIOUS, 'publisher': 'c', 'model_name': 'c/m', 'download_count': '3'},
+    ]):
+        new_models = db.load_new_models_between(CURRENT, PREVIOUS, model_category='ernie-4.5')
+
+        assert _keys(new_models) == [('b', '', '2')]
+        assert _keys(new_models) == _keys(_pandas_new_models(CURRENT, PREVIOUS, 'ernie-4.5', False))
+
+
+def test_duplicate_same_day_rows():
+    """同日同模型的多条记录只返回一条：优先有 base_model，其次 data_source，再次下载量"""
+    with temp_db([
+        {'date': CURRENT, 'publisher': 'a', 'model_name': 'a/m', 'download_count': '50',
+         'data_source': 'search'},
+        {'date': CURRENT, 'publisher': 'a', 'model_name': 'a/m', 'download_count': '40',
+         'data_source': 'model_tree', 'base_model': 'baidu/ERNIE-4.5-0.3B-PT'},
+        {'date': CURRENT, 'publisher': 'b', 'model_name': 'b/m', 'download_count': '5'},
+        {'date': CURRENT, 'publisher': 'b', 'model_name': 'b/m', 'download_count': '7'},
+        {'date': PREVIOUS, 'publisher': 'b', 'model_name': 'b/m', 'download_count': '1'},
+        {'date': PREVIOUS, 'publisher': 'b', 'model_name': 'b/m', 'download_count': '2'},
+    ]):
+        new_models = db.load_new_models_between(CURRENT, PREVIOUS, model_category='ernie-4.5')
+
+        assert _keys(new_models) == [('a', 'a/m', '40')]
+        assert new_models['base_model'].tolist() == ['baidu/ERNIE-4.5-0.3B-PT']
+        assert _keys(new_models) == _keys(_pandas_new_models(CURRENT, PREVIOUS, 'ernie-4.5', False))
+
+
+def test_require_base_model_matches_pandas():
+    """require_base_model=True 时与原 pandas 实现一致（包括 base_model_from_api 回填和占位符）"""
+    with temp_db([
+        # 本期有 base_model，上期同名记录没有 base_model：两天都筛选后算新增
+        {'date': CURRENT, 'publisher': 'a', 'model_name': 'a/m1', 'download_count': '1',
+         'base_model': 'baidu/ERNIE-4.5-0.3B-PT'},
+        {'date': PREVIOUS, 'publisher': 'a', 'model_name': 'a/m1', 'download_count': '1'},
+        # 只有 base_model_from_api
+        {'date': CURRENT, 'publisher': 'b', 'model_name': 'b/m2', 'download_count': '2',
+         'base_model_from_api': 'baidu/ERNIE-4.5-21B-A3B-PT'},
+        # 占位符视为没有 base_model
+        {'date': CURRENT, 'publisher': 'c', 'model_name': 'c/m3', 'download_count': '3',
+         'base_model': 'None'},
+        {'date': CURRENT, 'publisher': 'd', 'model_name': 'd/m4', 'download_count': '4',
+         'base_model': ''},
+        # 两天都有 base_model：不是新增
+        {'date': CURRENT, 'publisher': 'e', 'model_name': 'e/m5', 'download_count': '5',
+         'base_model': 'baidu/ERNIE-4.5-0.3B-PT'},
+        {'date': PREVIOUS, 'publisher': 'e', 'model_name': 'e/m5', 'download_count': '4',
+         'base_model': 'baidu/ERNIE-4.5-0.3B-PT'},
+        # 其他系列 / 其他平台不参与比较
+        {'date': CURRENT, 'publisher': 'f', 'model_name': 'f/m6', 'download_count': '6',
+         'base_model': 'PaddlePaddle/PaddleOCR-VL', 'model_category': 'paddleocr-vl'},
+        {'date': CURRENT, 'publisher': 'g', 'model_name': 'g/m7', 'download_count': '7',
+         'base_model': 'baidu/ERNIE-4.5-0.3B-PT', 'repo': 'ModelScope'},
+    ]):
+        new_models = db.load_new_models_between(CURRENT, PREVIOUS, model_category='ernie-4.5',
+                                                require_base_model=True)
+
+        assert _keys(new_models) == [('a', 'a/m1', '1'), ('b', 'b/m2', '2')]
+        assert _keys(new_models) == _keys(_pandas_new_models(CURRENT, PREVIOUS, 'ernie-4.5', True))
+        assert sorted(new_models['base_model'].tolist()) == ['baidu/ERNIE-4.5-0.3B-PT', 'baidu/ERNIE-4.5-21B-A3B-PT']
+
+
+if __name__ == "__main__":
+    tests = [
+        test_previous_date_without_rows,
+        test_null_and_empty_model_names,
+        test_duplicate_same_day_rows,
+        test_require_base_model_matches_pandas,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} 个测试失败")
+        sys.exit(1)
+    print("\n🎉 所有测试通过！")
+    sys.exit(0)
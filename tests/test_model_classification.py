@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+测试模型类型分类与标签解析（表驱动，期望值与改写前的逐条判断实现一致）
+
+验证：
+1. classify_model_type 的标签 / 名称兜底优先级（包括合并后的名称正则）
+2. 有模型卡时 标签 -> 模型卡 -> 名称 的判断顺序
+3. _index_tags 一次遍历得到的小写标签和 base_model
+4. parse_tags 的 json 快速路径与 ast.literal_eval 结果一致，脏数据返回空列表
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ast
+
+from ernie_tracker.fetchers.fetchers_modeltree import classify_model_type, parse_tags, _index_tags
+
+# (模型名, 标签, 期望类型)
+CLASSIFY_CASES = [
+    # 名称兜底：quantized > lora > adapter > merge > finetune > original
+    ('someone/ERNIE-4.5-0.3B-PT-GGUF', [], 'quantized'),
+    ('someone/ERNIE-4.5-0.3B-lora-gguf', [], 'quantized'),
+    ('someone/ERNIE-4.5-21B-A3B-PT-Q4_K_M', [], 'quantized'),
+    ('someone/ernie-4.5-w4a16', [], 'quantized'),
+    ('someone/ERNIE-4.5-mlx-4bit', [], 'quantized'),
+    ('someone/ERNIE-4.5-0.3B-fp8', [], 'quantized'),
+    ('someone/ERNIE-4.5-0.3B-LoRA', [], 'lora'),
+    ('someone/ernie-4.5-low-rank-adaptation', [], 'lora'),
+    ('someone/ERNIE-4.5-adapter', [], 'adapter'),
+    ('someone/ERNIE-4.5-peft-sft', [], 'adapter'),
+    ('someone/ERNIE-4.5-merged', [], 'merge'),
+    ('someone/ERNIE-4.5_merge-v2', [], 'merge'),
+    ('someone/ERNIE-4.5-0.3B-finetuned-chat', [], 'finetune'),
+    ('someone/ERNIE-4.5-trained-on-math', [], 'finetune'),
+    ('baidu/ERNIE-4.5-0.3B-PT', [], 'original'),
+    ('PaddlePaddle/PaddleOCR-VL', [], 'original'),
+    ('someone/ERNIE-4.5-0.3B-PT-bf16', [], 'other'),
+    ('someone/ERNIE-4.5-chat', [], 'other'),
+    # base_model:type: 结构化标签优先于名称，第一个带类型的标签生效
+    ('someone/ERNIE-4.5-chat', ['base_model:quantized:baidu/ERNIE-4.5-0.3B-PT'], 'quantized'),
+    ('someone/ERNIE-4.5-chat', ['base_model:adapter:baidu/ERNIE-4.5-0.3B-PT'], 'adapter'),
+    ('someone/ERNIE-4.5-chat', ['base_model:lora:baidu/ERNIE-4.5-0.3B-PT'], 'lora'),
+    ('someone/ERNIE-4.5-chat', ['base_model:merge:baidu/ERNIE-4.5-0.3B-PT'], 'merge'),
+    ('someone/ERNIE-4.5-chat', ['Base_Model:Finetune:baidu/ERNIE-4.5-0.3B-PT'], 'finetune'),
+    ('someone/ERNIE-4.5-gguf', ['base_model:finetune:baidu/ERNIE-4.5-0.3B-PT'], 'finetune'),
+    ('someone/ERNIE-4.5-chat', ['base_model:baidu/ERNIE-4.5-0.3B-PT'], 'other'),
+    ('someone/ERNIE-4.5-chat', ['base_model:quantized:x/y', 'base_model:lora:x/z'], 'quantized'),
+    ('someone/ERNIE-4.5-chat', ['base_model:lora:x/z', 'base_model:quantized:x/y'], 'lora'),
+    # PEFT 标签信号
+    ('someone/ERNIE-4.5-chat', ['peft', 'lora'], 'lora'),
+    ('someone/ERNIE-4.5-chat', ['peft'], 'adapter'),
+    ('someone/ERNIE-4.5-chat', ['prefix-tuning'], 'adapter'),
+    ('someone/ERNIE-4.5-chat', ['PEFT', 'safetensors'], 'adapter'),
+    ('someone/ERNIE-4.5-gguf', ['adapter'], 'adapter'),
+    ('someone/ERNIE-4.5-chat', ['text-generation', 'transformers'], 'other'),
+]
+
+# (模型名, 标签, 模型卡, 期望类型)
+CARD_CASES = [
+    ('someone/ERNIE-4.5-chat', [], {'quantization_config': {'bits': 4}}, 'quantized'),
+    ('someone/ERNIE-4.5-chat', [], {'lora_alpha': 16}, 'lora'),
+    ('someone/ERNIE-4.5-chat', [], {'adapter_config': {}}, 'adapter'),
+    ('someone/ERNIE-4.5-chat', [], {'merge_method': 'slerp'}, 'merge'),
+    ('someone/ERNIE-4.5-chat', [], {'finetuning_type': 'full'}, 'finetune'),
+    ('someone/ERNIE-4.5-chat', [], {'license': 'apache-2.0'}, 'other'),
+    ('someone/ERNIE-4.5-gguf', [], {'license': 'apache-2.0'}, 'quantized'),
+    ('someone/ERNIE-4.5-chat', ['base_model:lora:x/y'], {'quantization_config': {}}, 'lora'),
+    ('someone/ERNIE-4.5-chat', [], {'lora_alpha': 16, 'quantization_config': {}}, 'quantized'),
+]
+
+# (标签, 期望 base_model)
+INDEX_TAGS_CASES = [
+    ([], None),
+    (['Transformers', 'ERNIE'], None),
+    (['base_model:PaddlePaddle/PaddleOCR-VL'], 'PaddlePaddle/PaddleOCR-VL'),
+    (['base_model:adapter:baidu/ERNIE-4.5-0.3B-PT'], 'baidu/ERNIE-4.5-0.3B-PT'),
+    # 不含 / 或以 license: 开头的不是有效的 model ID，继续找下一个
+    (['base_model:finetune', 'base_model:quantized:baidu/ERNIE-4.5-21B-A3B-PT'], 'baidu/ERNIE-4.5-21B-A3B-PT'),
+    (['base_model:x:license:a/b', 'base_model:x/y'], 'x/y'),
+    # 取第一个有效的
+    (['base_model:a/b', 'base_model:lora:c/d'], 'a/b'),
+    # 大小写敏感：Base_Model: 不是 base_model 标签
+    (['Base_Model:a/b'], None),
+]
+
+# tags 字符串（由 repr(list) 写入），期望与 ast.literal_eval 一致
+PARSE_TAGS_LITERALS = [
+    [],
+    ['transformers', 'safetensors'],
+    ['base_model:adapter:baidu/ERNIE-4.5-0.3B-PT', 'license:apache-2.0'],
+    ["it's", 'quote"inside'],
+    ['back\\slash', 'tab\tnewline\n'],
+    ['中文标签', 'émoji 🚀'],
+    ['nul\x00'],
+    [1, 2.5, None, True],
+]
+
+# 无法解析的 tags 一律视为空列表
+PARSE_TAGS_INVALID = [
+    None,
+    '',
+    'not a list',
+    "{'a': 1}",
+    "['unterminated",
+    '[' * 100000,
+    'x' * 10 + '(',
+]
+
+
+def test_classify_model_type():
+    """无模型卡：标签优先，其次名称兜底"""
+    for name, tags, expected in CLASSIFY_CASES:
+        result = classify_model_type(name, tags, None)
+        assert result == expected, (name, tags, result, expected)
+
+
+def test_classify_model_type_with_card():
+    """有模型卡：标签 -> 模型卡 -> 名称"""
+    for name, tags, card_data, expected in CARD_CASES:
+        result = classify_model_type(name, tags, None, card_data)
+        assert result == expected, (name, tags, card_data, result, expected)
+
+
+def test_index_tags():
+    """小写标签与第一个有效的 base_model"""
+    for tags, expected_base in INDEX_TAGS_CASES:
+        tags_lower, base_model = _index_tags(tags)
+        assert tags_lower == tuple(tag.lower() for tag in tags), (tags, tags_lower)
+        assert base_model == expected_base, (tags, base_model, expected_base)
+
+
+def test_parse_tags():
+    """json 快速路径与 literal_eval 结果一致；列表原样返回；脏数据返回空列表"""
+    for tags in PARSE_TAGS_LITERALS:
+        raw = repr(tags)
+        assert parse_tags(raw) == ast.literal_eval(raw), (raw, parse_tags(raw))
+
+    tags = ['already', 'parsed']
+    assert parse_tags(tags) is tags
+
+    for raw in PARSE_TAGS_INVALID:
+        assert parse_tags(raw) == [], (raw[:20] if raw else raw, parse_tags(raw))
+
+    # 返回新列表，修改结果不影响缓存
+    first = parse_tags("['a', 'b']")
+    first.append('c')
+    assert parse_tags("['a', 'b']") == ['a', 'b']
+
+
+if __name__ == "__main__":
+    tests = [
+        test_classify_model_type,
+        test_classify_model_type_with_card,
+        test_index_tags,
+        test_parse_tags,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} 个测试失败")
+        sys.exit(1)
+    print("\n🎉 所有测试通过！")
+    sys.exit(0)
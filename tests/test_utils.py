@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+测试 ernie_tracker.utils 中的下载量解析与等待条件
+
+验证：
+1. extract_numbers 解析纯数字和 k/M/w 简写
+2. DownloadTextStable 在下载量（包括简写）连续两次一致时返回原始文本
+"""
+
+import sys
+import os
+
+# 添加项目根目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ernie_tracker.utils import DownloadTextStable, extract_numbers
+
+
+class FakeDriver:
+    """按顺序返回预设文本的假 driver（只实现 execute_script）"""
+
+    def __init__(self, texts):
+        self.texts = list(texts)
+
+    def execute_script(self, script, *args):
+        return self.texts.pop(0)
+
+
+def _poll(texts):
+    """模拟 WebDriverWait：依次轮询，返回第一个非 False 的结果（全部未稳定时返回 None）"""
+    driver = FakeDriver(texts)
+    condition = DownloadTextStable('//div', script='return "";')
+    for _ in range(len(texts)):
+        result = condition(driver)
+        if result is not False:
+            return result
+    return None
+
+
+def test_extract_numbers():
+    """纯数字、逗号分隔与 k/M/w 简写"""
+    cases = [
+        ('72456', 72456),
+        ('72,456', 72456),
+        ('7.3k', 7300),
+        ('1.2M', 1200000),
+        ('7.3w', 73000),
+        ('1k+', 1000),
+        ('', None),
+        ('暂无', None),
+    ]
+    for text, expected in cases:
+        assert extract_numbers(text) == expected, (text, extract_numbers(text))
+
+
+def test_download_text_stable():
+    """数值连续两次一致才返回；简写同样视为稳定，返回原始字符串"""
+    cases = [
+        (['123', '123'], '123'),
+        (['1,234', '1,234'], '1234'),
+        (['7.3k', '7.3k'], '7.3k'),
+        (['1.2M', '1.2M'], '1.2M'),
+        (['7.3w', '7.3w'], '7.3w'),
+        (['1k+', '1k+'], '1k+'),
+        # 数值仍在变化：等到两次一致
+        (['0', '12', '15', '15'], '15'),
+        # 空文本或无法解析的文本不算稳定
+        (['', ''], None),
+        (['加载中', '加载中'], None),
+        # 只出现一次的值不算稳定
+        (['7.3k'], None),
+    ]
+    for texts, expected in cases:
+        assert _poll(texts) == expected, (texts, _poll(texts))
+
+
+if __name__ == "__main__":
+    tests = [test_extract_numbers, test_download_text_stable]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    if failed:
+        print(f"\n❌ {failed} 个测试失败")
+        sys.exit(1)
+    print("\n🎉 所有测试通过！")
+    sys.exit(0)